@@ -1,50 +1,25 @@
 import streamlit as st
 import sqlite3
 import re
+import json
 import pandas as pd
-import numpy as np
-import joblib
-import socket
 import os
-import ast
-from fuzzywuzzy import process
 from streamlit_tags import st_tags
-import gdown
-import os
-
-def download_if_missing_drive(file_id, filename):
-    """Download file from Google Drive"""
-    if not os.path.exists(filename):
-        with st.spinner(f"Downloading {filename} from Google Drive..."):
-            url = f"https://drive.google.com/uc?id={file_id}"
-            gdown.download(url, filename, quiet=False)
-
-try:
-    import dns.resolver
-except Exception:
-    dns = None
+from predictncure import db
+from predictncure.credentials import CredentialsBusy
+from predictncure.artifacts import ArtifactManager, configured_model
+from predictncure.email_check import default_validator
+from predictncure.metrics import registry, span
+from predictncure.predictor import MIN_SYMPTOMS, predict_batch
+from predictncure.resources import DATASET_PATH, load_artifacts
+from predictncure.result_cache import live_stats
+from predictncure.schema import SCHEMA_PATH
 
 # ---------------- PAGE CONFIG ----------------
 st.set_page_config(page_title="PredictNCure", layout="wide")
 
 # ---------------- DB INIT ----------------
-def init_db():
-    with sqlite3.connect("database.db") as conn:
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT UNIQUE,
-                        password TEXT,
-                        email TEXT,
-                        role TEXT)''')
-        c.execute('''CREATE TABLE IF NOT EXISTS ratings (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        user_id INTEGER,
-                        rating INTEGER,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''')
-        conn.commit()
-
-init_db()
+db.get_pool()
 
 # ---------------- SESSION DEFAULTS ----------------
 for key in ["page","logged_in","role","user_id","section","temp_rating","admin_option","symptom_input_reset"]:
@@ -58,18 +33,6 @@ for key in ["page","logged_in","role","user_id","section","temp_rating","admin_o
         )
 
 # ---------------- HELPERS ----------------
-def normalize_key(text: str) -> str:
-    if not text:
-        return ""
-    return re.sub(r'[\s_\-]+', '', text.lower().strip())
-
-def get_info(info_dict, disease_name):
-    norm = normalize_key(disease_name)
-    for k, v in info_dict.items():
-        if normalize_key(k) == norm:
-            return v
-    return "No data"
-
 def card(content, bg="#f5f7fa", padding=20):
     st.markdown(f"""
         <div style='background-color:{bg}; padding:{padding}px; border-radius:12px;
@@ -78,31 +41,19 @@ def card(content, bg="#f5f7fa", padding=20):
         </div>
     """, unsafe_allow_html=True)
 
-def clean_description_paragraph(text):
-    if not text:
-        return "No data available."
-    try:
-        parsed = ast.literal_eval(text)
-        if isinstance(parsed, list):
-            return " ".join(parsed)
-        return str(parsed)
-    except:
-        return str(text)
-
-def clean_and_bullet(text):
-    if not text:
-        return "- No data"
-    try:
-        parsed = ast.literal_eval(text)
-        items = parsed if isinstance(parsed, list) else [parsed]
-    except:
-        items = re.split(r',|;|\.', str(text))
-    cleaned = []
-    for item in items:
-        item = item.strip().replace("[", "").replace("]", "").replace("'", "").replace('"', "")
-        if item:
-            cleaned.append(item)
-    return "- No data" if not cleaned else "- " + "\n- ".join(cleaned)
+def paged_table(key, fetch, columns, page_size=50):
+    """Show one keyset-paginated page of rows; ``fetch(limit, after_id)`` returns rows whose first field is the id."""
+    cursors = st.session_state.setdefault(f"{key}_cursors", [None])
+    rows = fetch(page_size, cursors[-1])
+    st.dataframe(pd.DataFrame([r[1:] for r in rows], columns=columns))
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    col_page.caption(f"Page {len(cursors)}")
+    if col_prev.button("◀ Previous", key=f"{key}_prev", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun()
+    if col_next.button("Next ▶", key=f"{key}_next", disabled=len(rows) < page_size):
+        cursors.append(rows[-1][0])
+        st.rerun()
 
 def validate_username(username: str) -> bool:
     if not username or len(username.strip()) < 5:
@@ -123,74 +74,31 @@ def validate_password(password: str) -> bool:
 def validate_email_real(email: str):
     if not re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
         return False, "Invalid email format."
-    domain = email.split('@')[1]
-    if dns:
-        try:
-            dns.resolver.resolve(domain, 'MX')
-            return True, ""
-        except Exception:
-            try:
-                socket.gethostbyname(domain)
-                return True, ""
-            except Exception:
-                return False, "Email domain does not resolve."
-    else:
-        try:
-            socket.gethostbyname(domain)
-            return True, ""
-        except Exception:
-            return False, "Email domain does not resolve."
+    return default_validator().check(email.split('@')[1])
 
 # ---------------- LOAD RESOURCES ----------------
 @st.cache_resource
 def load_resources():
-    
-    download_if_missing_drive("1i2G2cUL-OLr-H1x3hqRJB-qrO6K_Um_9", "lgb_fast.pkl")
-    download_if_missing_drive("1Y4TOBbA862rYfN_2aZbtu1RvzfZ3rLs2", "xgb_fast.pkl")
-    download_if_missing_drive("1i4aZqF5mESX4lLcfKqnwnt8m3d2U7xBD", "Diseases_and_Symptoms_dataset.csv")
-    
-    model_files = ["lgb_fast.pkl", "xgb_fast.pkl"]
-    enc_files = ["disease_encoder.pkl"]
-
-    
-    model_path = next((x for x in model_files if os.path.exists(x)), None)
-    enc_path = next((x for x in enc_files if os.path.exists(x)), None)
-
-    if not model_path or not enc_path:
-        st.error("Model or encoder missing in root folder.")
-        st.stop()
-
-    model = joblib.load(model_path)
-    le = joblib.load(enc_path)
-
-    dataset_path = "Diseases_and_Symptoms_dataset.csv"
-    if os.path.exists(dataset_path):
-        df = pd.read_csv(dataset_path)
-        symptom_cols = [c for c in df.columns if c.lower() not in ("diseases","disease")]
-    else:
-        st.error("Dataset missing: Diseases_and_Symptoms_dataset.csv not found.")
+    try:
+        # A trained bundle (PREDICTNCURE_BUNDLE) is self-contained; nothing to download.
+        if os.environ.get("PREDICTNCURE_BUNDLE"):
+            res = load_artifacts()
+        else:
+            manager = ArtifactManager()
+            model_name = configured_model()
+            needed = [model_name]
+            if not os.path.exists(SCHEMA_PATH):
+                needed.append(DATASET_PATH)
+            missing = manager.missing(needed)
+            if missing:
+                with st.spinner(f"Downloading {', '.join(missing)}..."):
+                    manager.fetch_all(missing)
+            manager.warn_unpinned(needed)
+            res = load_artifacts(model_files=[model_name], fetch_dataset=manager.fetch)
+    except (OSError, ValueError) as e:
+        st.error(str(e))
         st.stop()
-
-    # Load info CSVs
-    def load_map(path):
-        if not os.path.exists(path):
-            return {}
-        table = pd.read_csv(path)
-        if table.shape[1] < 2:
-            return {}
-        keys = table.iloc[:, 0].astype(str).apply(normalize_key)
-        values = table.iloc[:, 1].astype(str).str.strip()
-        return dict(zip(keys, values))
-
-    info = {
-        "description": load_map("description.csv"),
-        "precautions": load_map("precautions.csv"),
-        "medications": load_map("medications.csv"),
-        "diets": load_map("diets.csv"),
-        "workout": load_map("workout.csv")
-    }
-
-    return model, le, symptom_cols, info
+    return res
 
 # ---------------- AUTH PAGES ----------------
 def show_login():
@@ -218,13 +126,11 @@ def show_login():
             return
 
         # ---------- NORMAL USER LOGIN (SQLITE) ----------
-        with sqlite3.connect("database.db") as conn:
-            c = conn.cursor()
-            c.execute(
-                "SELECT * FROM users WHERE username=? AND password=?",
-                (username, password)
-            )
-            user = c.fetchone()
+        try:
+            user = db.find_user(username, password)
+        except CredentialsBusy as e:
+            st.error(str(e))
+            return
 
         if user:
             st.success(f"Welcome, {username}!")
@@ -262,15 +168,13 @@ def show_register():
                 st.warning("Passwords do not match.")
             else:
                 try:
-                    with sqlite3.connect("database.db") as conn:
-                        c = conn.cursor()
-                        c.execute("INSERT INTO users (username,password,email,role) VALUES (?,?,?,?)",
-                                  (username, password, email, "user"))
-                        conn.commit()
+                    db.create_user(username, password, email, "user")
                     st.success("Registration successful! Please login.")
                     st.session_state.page = "login"
                 except sqlite3.IntegrityError:
                     st.error("Username already exists.")
+                except CredentialsBusy as e:
+                    st.error(str(e))
     if st.button("🔙 Back to Login"): st.session_state.page = "login"
 
 def show_forgot():
@@ -284,45 +188,78 @@ def show_forgot():
         elif new_pass != confirm_pass:
             st.warning("Passwords do not match.")
         else:
-            with sqlite3.connect("database.db") as conn:
-                c = conn.cursor()
-                c.execute("SELECT * FROM users WHERE email=?", (email,))
-                user = c.fetchone()
-                if user:
-                    c.execute("UPDATE users SET password=? WHERE email=?", (new_pass, email))
-                    conn.commit()
-                    st.success("Password updated! Please login.")
-                    st.session_state.page = "login"
-                else:
-                    st.error("Email not found.")
+            try:
+                updated = db.reset_password(email, new_pass)
+            except CredentialsBusy as e:
+                st.error(str(e))
+                return
+            if updated:
+                st.success("Password updated! Please login.")
+                st.session_state.page = "login"
+            else:
+                st.error("Email not found.")
     if st.button("🔙 Back to Login"): st.session_state.page = "login"
 
 # ---------------- ADMIN DASHBOARD ----------------
 def show_admin_dashboard():
     st.sidebar.title("📊 Admin Dashboard")
-    options = ["Home", "Users", "Ratings", "Logout"]
+    options = ["Home", "Users", "Ratings", "Performance", "Logout"]
     st.session_state.admin_option = st.sidebar.radio("Navigate", options)
     if st.session_state.admin_option == "Home":
         st.markdown("<h1 style='text-align:center;'>🏠 Admin Home</h1>", unsafe_allow_html=True)
-        with sqlite3.connect("database.db") as conn:
-            c = conn.cursor()
-            c.execute("SELECT COUNT(*) FROM users WHERE role='user'")
-            user_count = c.fetchone()[0]
-            c.execute("SELECT COUNT(*) FROM ratings")
-            rating_count = c.fetchone()[0]
+        user_count = db.count_users("user")
+        rating_count = db.count_ratings()
         col1, col2 = st.columns(2)
         col1.metric("👥 Users", user_count)
         col2.metric("⭐ Ratings", rating_count)
     elif st.session_state.admin_option == "Users":
         st.title("👥 Registered Users")
-        with sqlite3.connect("database.db") as conn:
-            df = pd.read_sql_query("SELECT username,email,role FROM users", conn)
-        st.dataframe(df)
+        paged_table("users", db.list_users, ["username", "email", "role"])
     elif st.session_state.admin_option == "Ratings":
         st.title("⭐ Ratings")
-        with sqlite3.connect("database.db") as conn:
-            df = pd.read_sql_query("SELECT user_id,rating,created_at FROM ratings", conn)
-        st.dataframe(df)
+        summary = db.rating_summary()
+        col1, col2 = st.columns(2)
+        col1.metric("⭐ Ratings", summary["count"])
+        col2.metric("Average", f"{summary['mean']:.2f}" if summary["mean"] is not None else "–")
+        if summary["count"]:
+            col1.bar_chart(pd.Series(summary["histogram"], name="ratings"))
+            daily = pd.DataFrame(summary["daily"], columns=["day", "ratings", "average"]).set_index("day")
+            col2.line_chart(daily["ratings"])
+        paged_table("ratings", db.list_ratings, ["user_id", "rating", "created_at"])
+    elif st.session_state.admin_option == "Performance":
+        st.title("⏱ Performance")
+        snapshot = registry.snapshot()
+        # Read from the live caches; opening this page must not load the model.
+        stats = live_stats()
+        if stats is None:
+            st.info("The model has not been loaded yet; cache statistics appear after the first prediction.")
+        else:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Cache hit rate", f"{stats['hit_rate']:.0%}")
+            col2.metric("Cache hits / misses", f"{stats['hits']} / {stats['misses']}")
+            col3.metric("Cached results", stats["size"])
+
+        st.subheader("Latency by stage (ms)")
+        if snapshot["spans"]:
+            spans = pd.DataFrame.from_dict(snapshot["spans"], orient="index")
+            ms = ["mean", "p50", "p95", "p99", "max"]
+            spans[ms] = spans[ms] * 1000
+            st.dataframe(spans[["count"] + ms].round(3))
+        else:
+            st.info("No timings recorded yet.")
+
+        st.subheader("Slowest recent requests")
+        if snapshot["slowest"]:
+            slowest = pd.DataFrame(snapshot["slowest"])
+            slowest["time"] = pd.to_datetime(slowest["time"], unit="s")
+            slowest["ms"] = (slowest.pop("seconds") * 1000).round(2)
+            st.dataframe(slowest)
+        else:
+            st.info("No predictions recorded yet.")
+
+        col1, col2 = st.columns(2)
+        col1.download_button("Prometheus metrics", registry.prometheus(), "metrics.prom", "text/plain")
+        col2.download_button("JSON snapshot", json.dumps(snapshot, default=str), "metrics.json", "application/json")
     elif st.session_state.admin_option == "Logout":
         if st.button("Confirm Logout"):
             st.session_state.logged_in = False
@@ -331,7 +268,7 @@ def show_admin_dashboard():
 
 # ---------------- USER WEBSITE ----------------
 def show_user_website():
-    model, le, symptom_cols, info = load_resources()
+    res = load_resources()
     st.session_state.setdefault("section", "home")
 
     sections = ["home", "about", "rate", "logout"]
@@ -353,11 +290,17 @@ def show_user_website():
         st.markdown("<h1 style='text-align:center;'>🩺 Welcome to PredictNCure</h1>", unsafe_allow_html=True)
         st.subheader("Enter your symptoms")
 
+        # Only the ranked matches for the search box go to the browser, not the whole symptom list.
+        query = st.text_input("Search symptoms", placeholder="e.g. tummy ache",
+                              help="Matching symptoms are offered as suggestions in the box below.",
+                              key=f"symptom_query_{st.session_state.symptom_input_reset}")
+        suggestions = res.autocomplete(query, 20)
+
         input_symptoms = st_tags(
             label="",
             text='Type each symptom and press enter',
             value=[],
-            suggestions=symptom_cols,
+            suggestions=suggestions,
             maxtags=10,
             key=f"symptom_input_{st.session_state.symptom_input_reset}"
         )
@@ -365,58 +308,41 @@ def show_user_website():
         col_pred, col_clear = st.columns(2)
         with col_pred:
             if st.button("Predict"):
-                if len(input_symptoms) < 3:
+                if len(input_symptoms) < MIN_SYMPTOMS:
                     st.warning("⚠ Please enter at least 3 symptoms for a more reliable prediction.")
                 else:
-                    matched_symptoms = []
-                    for s in input_symptoms:
-                        match, score = process.extractOne(s, symptom_cols)
-                        if score >= 70:
-                            matched_symptoms.append(match)
+                    result = predict_batch(res.model, res.le, res.matcher, [input_symptoms], res.encoder,
+                                           cache=res.cache, recommendations=res.recommendations,
+                                           ranker=res.ranker)[0]
+                    primary, conf = result["primary"], result["confidence"]
+                    if result["status"] == "unmatched":
+                        st.error(f"Sorry, we couldn't find '{result['unmatched'][0]}' in our database.")
+                    elif result["status"] == "low_confidence":
+                        st.warning(f"⚠ Prediction confidence is low ({conf:.2f}%). Please add more or different symptoms.")
+                    else:
+                        st.success(f"Primary Disease: {primary} ({conf:.2f}%)")
+
+                        st.subheader("Other Possible Diseases")
+                        others = result["others"]
+                        if others:
+                            for nm, cval in others:
+                                st.info(f"{nm} — {cval:.2f}%")
                         else:
-                            st.error(f"Sorry, we couldn't find '{s}' in our database.")
-                            matched_symptoms = []
-                            break
-
-                    if matched_symptoms:
-                        X = np.array([1 if sym in matched_symptoms else 0 for sym in symptom_cols])
-                        probs = model.predict_proba([X])[0]
-                        top_idx = np.argsort(probs)[::-1][:5]
-                        primary_idx = top_idx[0]
-                        primary = le.inverse_transform([primary_idx])[0]
-                        conf = probs[primary_idx] * 100
-
-                        min_conf = 75.0
-                        if conf < min_conf:
-                            st.warning(f"⚠ Prediction confidence is low ({conf:.2f}%). Please add more or different symptoms.")
-                        else:
-                            st.success(f"Primary Disease: {primary} ({conf:.2f}%)")
-
-                            st.subheader("Other Possible Diseases")
-                            allowed_gap = 80
-                            others = []
-                            for idx in top_idx[1:]:
-                                conf_other = probs[idx] * 100
-                                if (conf - conf_other) <= allowed_gap:
-                                    others.append((le.inverse_transform([idx])[0], conf_other))
-
-                            if others:
-                                for nm, cval in others:
-                                    st.info(f"{nm} — {cval:.2f}%")
-                            else:
-                                st.warning("No other close-probability diseases.")
-
-                            st.subheader("Recommendations")
+                            st.warning("No other close-probability diseases.")
+
+                        st.subheader("Recommendations")
+                        rec = result.get("recommendations") or res.recommendations.get(primary)["markdown"]
+                        with span("render.recommendations"):
                             with st.expander("📋 Description"):
-                                st.markdown(clean_description_paragraph(get_info(info["description"], primary)))
+                                st.markdown(rec["description"])
                             with st.expander("💊 Medications"):
-                                st.markdown(clean_and_bullet(get_info(info["medications"], primary)))
+                                st.markdown(rec["medications"])
                             with st.expander("🍎 Diet"):
-                                st.markdown(clean_and_bullet(get_info(info["diets"], primary)))
+                                st.markdown(rec["diets"])
                             with st.expander("🛡 Precautions"):
-                                st.markdown(clean_and_bullet(get_info(info["precautions"], primary)))
+                                st.markdown(rec["precautions"])
                             with st.expander("💪 Workout"):
-                                st.markdown(clean_and_bullet(get_info(info["workout"], primary)))
+                                st.markdown(rec["workout"])
 
         with col_clear:
             if st.button("Clear"):
@@ -458,10 +384,7 @@ def show_user_website():
     # ---------------- RATE ----------------
     elif st.session_state.section == "rate":
         st.subheader("⭐ Rate Our Service")
-        with sqlite3.connect("database.db") as conn:
-            c = conn.cursor()
-            c.execute("SELECT COUNT(*) FROM ratings WHERE user_id=?", (st.session_state.user_id,))
-            already_rated = c.fetchone()[0] > 0
+        already_rated = db.has_rated(st.session_state.user_id)
         if already_rated:
             st.info("You have already rated our service. Thank you! ⭐")
         else:
@@ -473,10 +396,7 @@ def show_user_website():
             card(stars_html, bg="#fff8e1", padding=12)
             if st.button("Submit Rating"):
                 if st.session_state.temp_rating > 0:
-                    with sqlite3.connect("database.db") as conn:
-                        c = conn.cursor()
-                        c.execute("INSERT INTO ratings(user_id,rating) VALUES (?,?)", (st.session_state.user_id, st.session_state.temp_rating))
-                        conn.commit()
+                    db.add_rating(st.session_state.user_id, st.session_state.temp_rating)
                     st.success(f"Thank you for rating {st.session_state.temp_rating}★!")
                     st.session_state.temp_rating = 0
                 else:
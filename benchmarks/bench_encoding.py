@@ -0,0 +1,67 @@
+"""Microbenchmark of symptom feature encoding, single and batched.
+
+Compares the old list-membership vector with FeatureEncoder. Uses the symptom
+schema when present, otherwise synthetic column names.
+
+Usage: python benchmarks/bench_encoding.py [--schema symptom_schema.json] [--batch 10000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from predictncure.encoding import FeatureEncoder
+
+
+def list_membership(symptom_cols, matched):
+    return np.array([1 if sym in matched else 0 for sym in symptom_cols])
+
+
+def rate(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schema", default="symptom_schema.json")
+    parser.add_argument("--batch", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    if os.path.exists(args.schema):
+        with open(args.schema, encoding="utf-8") as f:
+            symptom_cols = json.load(f)["symptoms"]
+    else:
+        symptom_cols = [f"symptom {i}" for i in range(377)]
+    rng = random.Random(0)
+    rows = [rng.sample(symptom_cols, rng.randint(3, 10)) for _ in range(args.batch)]
+    encoder = FeatureEncoder(symptom_cols)
+    buf = np.zeros(encoder.n_features, dtype=np.float32)
+
+    print(f"columns={len(symptom_cols)} batch={args.batch}")
+    print(f"single  list membership : {rate(lambda: list_membership(symptom_cols, rows[0]), args.repeat):>12,.0f} rows/s")
+    print(f"single  encode_one      : {rate(lambda: encoder.encode_one(rows[0]), args.repeat):>12,.0f} rows/s")
+    print(f"single  encode_into     : {rate(lambda: encoder.encode_into(rows[0], buf), args.repeat):>12,.0f} rows/s")
+
+    start = time.perf_counter()
+    dense = np.array([list_membership(symptom_cols, r) for r in rows])
+    dense_s = time.perf_counter() - start
+    start = time.perf_counter()
+    csr = encoder.encode_batch(rows)
+    csr_s = time.perf_counter() - start
+    csr_bytes = csr.data.nbytes + csr.indices.nbytes + csr.indptr.nbytes
+    print(f"batch   list membership : {args.batch / dense_s:>12,.0f} rows/s  {dense.nbytes / 1e6:8.2f} MB")
+    print(f"batch   encode_batch    : {args.batch / csr_s:>12,.0f} rows/s  {csr_bytes / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Single-row inference latency: wrapped model vs FastModel, with a parity check.
+
+Without arguments a small synthetic LightGBM model is trained so the benchmark
+runs offline; pass --model to time a real pickle.
+
+Usage: python benchmarks/bench_inference.py [--model lgb_fast.pkl] [--requests 2000] [--compile]
+"""
+import argparse
+import os
+import sys
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from predictncure.fast_inference import FastModel
+
+
+def synthetic_model(n_features=377, n_classes=40, rows=20000, seed=0):
+    import lightgbm as lgb
+    rng = np.random.default_rng(seed)
+    X = (rng.random((rows, n_features)) < 0.02).astype(np.float32)
+    y = (X[:, :n_classes].argmax(axis=1) + X[:, n_classes:].sum(axis=1).astype(int)) % n_classes
+    return lgb.LGBMClassifier(n_estimators=50, num_leaves=31, verbose=-1).fit(X, y)
+
+
+def latencies(fn, rows):
+    out = []
+    for row in rows:
+        start = time.perf_counter()
+        fn(row)
+        out.append(time.perf_counter() - start)
+    return np.array(out) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--compile", action="store_true", help="also consider the compiled NumPy forest")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+    if args.model:
+        import joblib
+        model = joblib.load(args.model)
+    else:
+        model = synthetic_model()
+    start = time.perf_counter()
+    fast = FastModel(model, compile=args.compile)
+    print(f"FastModel built in {(time.perf_counter() - start) * 1000:.1f} ms")
+    n_features = fast.n_features
+
+    rng = np.random.default_rng(1)
+    rows = []
+    for _ in range(args.requests):
+        row = np.zeros((1, n_features), dtype=np.float32)
+        row[0, rng.choice(n_features, size=rng.integers(3, 11), replace=False)] = 1
+        rows.append(row)
+
+    diff = max(np.abs(fast.predict_proba(r) - model.predict_proba(r)).max() for r in rows[:200])
+    print(f"fast path: {fast.path}  max |Δp| = {diff:.2e}")
+    for name, fn in (("predict_proba", model.predict_proba), ("FastModel", fast.predict_proba)):
+        t = latencies(fn, rows)
+        print(f"{name:>14}: p50={np.percentile(t, 50):.3f} ms  p99={np.percentile(t, 99):.3f} ms  "
+              f"mean={t.mean():.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
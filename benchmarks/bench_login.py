@@ -0,0 +1,124 @@
+"""Login throughput under concurrent clients with the configured password KDF.
+
+Seeds a scratch database, then has ``--clients`` threads log in as fast as
+they can for ``--duration`` seconds through ``db.find_user``. Reports logins
+per second, latency percentiles and ``CredentialsBusy`` rejections. A probe
+thread times a small fixed CPU task (standing in for a prediction) before and
+during the storm, to show how much the bounded auth pool leaves for the rest
+of the process. ``--legacy`` seeds plaintext passwords to measure the one-off
+upgrade on first login.
+
+Usage: python benchmarks/bench_login.py [--password-hash scrypt:n=16384,r=8,p=1] [--clients 32] [--workers 2]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from predictncure import db
+from predictncure.credentials import DEFAULT_HASH, Credentials, CredentialsBusy, PasswordHasher
+
+
+def seed(path, n_users, hasher, legacy):
+    # Every user shares one precomputed hash so seeding does not dominate the run.
+    stored = "secret1" if legacy else hasher.hash("secret1")
+    db.get_pool(path)
+    with db.connection(path) as conn:
+        conn.executemany("INSERT INTO users (username,password,email,role) VALUES (?,?,?,'user')",
+                         [(f"user{i}", stored, f"user{i}@example.com") for i in range(n_users)])
+
+
+def probe(stop, samples, x):
+    while not stop.is_set():
+        start = time.perf_counter()
+        for _ in range(20):
+            x = np.tanh(x @ x.T)[:64, :64]
+        samples.append(time.perf_counter() - start)
+        time.sleep(0.01)
+
+
+def run_probe(seconds):
+    samples, stop = [], threading.Event()
+    thread = threading.Thread(target=probe, args=(stop, samples, np.random.rand(64, 64)))
+    thread.start()
+    time.sleep(seconds)
+    stop.set()
+    thread.join()
+    return samples
+
+
+def client(path, n_users, credentials, deadline, seed_value, latencies, stats, lock):
+    rng = random.Random(seed_value)
+    local, ok, busy = [], 0, 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            ok += db.find_user(f"user{rng.randrange(n_users)}", "secret1", path=path,
+                               credentials=credentials) is not None
+        except CredentialsBusy:
+            busy += 1
+            continue
+        local.append(time.perf_counter() - start)
+    with lock:
+        latencies.extend(local)
+        stats["ok"] += ok
+        stats["busy"] += busy
+
+
+def ms(samples, q):
+    return np.percentile(samples, q) * 1000 if samples else float("nan")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--password-hash", default=os.environ.get("PREDICTNCURE_PASSWORD_HASH", DEFAULT_HASH))
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    hasher = PasswordHasher(args.password_hash)
+    credentials = Credentials(hasher, workers=args.workers, max_pending=args.max_pending, timeout=1.0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "login.db")
+        seed(path, args.users, hasher, args.legacy)
+        idle = run_probe(2.0)
+
+        latencies, stats, lock = [], {"ok": 0, "busy": 0}, threading.Lock()
+        deadline = time.perf_counter() + args.duration
+        threads = [threading.Thread(target=client, args=(path, args.users, credentials, deadline, n, latencies,
+                                                         stats, lock))
+                   for n in range(args.clients)]
+        samples, stop = [], threading.Event()
+        prober = threading.Thread(target=probe, args=(stop, samples, np.random.rand(64, 64)))
+        start = time.perf_counter()
+        for t in threads + [prober]:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        stop.set()
+        prober.join()
+        db.get_pool(path).close()
+
+    print(f"hash={hasher.prefix.strip('$')} workers={args.workers} clients={args.clients}")
+    print(f"logins={stats['ok']} busy={stats['busy']} elapsed={elapsed:.2f}s "
+          f"throughput={stats['ok'] / elapsed:,.1f} logins/s")
+    print(f"login latency p50={ms(latencies, 50):.1f} ms p95={ms(latencies, 95):.1f} ms "
+          f"p99={ms(latencies, 99):.1f} ms")
+    print(f"probe p50 idle={ms(idle, 50):.2f} ms during storm={ms(samples, 50):.2f} ms "
+          f"(p95 {ms(idle, 95):.2f} -> {ms(samples, 95):.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Compare SymptomMatcher with per-tag process.extractOne for quality and latency.
+
+Usage: python benchmarks/bench_matcher.py [--schema symptom_schema.json | --dataset Diseases_and_Symptoms_dataset.csv]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzywuzzy import process
+
+from predictncure.matcher import MATCH_THRESHOLD, SymptomMatcher
+from predictncure.schema import read_symptom_header
+
+
+def make_queries(symptoms, n, seed=0):
+    """Exact names, reformatted names, single-typo names and unrelated words."""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(n):
+        sym = rng.choice(symptoms)
+        kind = rng.random()
+        if kind < 0.25:
+            queries.append(sym)
+        elif kind < 0.45:
+            queries.append(sym.upper().replace(" ", "_"))
+        elif kind < 0.9:
+            pos = rng.randrange(len(sym))
+            queries.append(sym[:pos] + sym[pos + 1:])
+        else:
+            queries.append("".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(4, 12))))
+    return queries
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def time_per_query(fn, queries):
+    timings = []
+    results = []
+    for q in queries:
+        start = time.perf_counter()
+        results.append(fn(q))
+        timings.append(time.perf_counter() - start)
+    return results, timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schema", default="symptom_schema.json")
+    parser.add_argument("--dataset", default="Diseases_and_Symptoms_dataset.csv")
+    parser.add_argument("-n", type=int, default=500)
+    args = parser.parse_args()
+
+    if os.path.exists(args.schema):
+        with open(args.schema, encoding="utf-8") as f:
+            symptoms = json.load(f)["symptoms"]
+    else:
+        symptoms = read_symptom_header(args.dataset)
+    queries = make_queries(symptoms, args.n)
+
+    start = time.perf_counter()
+    matcher = SymptomMatcher(symptoms)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    baseline, base_t = time_per_query(lambda q: process.extractOne(q, symptoms), queries)
+    indexed, idx_t = time_per_query(matcher.match, queries)
+    start = time.perf_counter()
+    matcher.match_many(queries)
+    batch_s = time.perf_counter() - start
+
+    same_match = sum(a[0] == b[0] for a, b in zip(baseline, indexed))
+    same_accept = sum((a[1] >= MATCH_THRESHOLD) == (b[1] >= MATCH_THRESHOLD) for a, b in zip(baseline, indexed))
+    print(f"symptoms={len(symptoms)} queries={len(queries)} index build={build_ms:.1f} ms")
+    print(f"same match: {same_match}/{len(queries)}  same accept/reject at {MATCH_THRESHOLD}: {same_accept}/{len(queries)}")
+    for name, t in (("extractOne", base_t), ("SymptomMatcher", idx_t)):
+        print(f"{name:>15}: mean={sum(t) / len(t) * 1e3:.3f} ms p50={percentile(t, 50) * 1e3:.3f} ms "
+              f"p95={percentile(t, 95) * 1e3:.3f} ms")
+    print(f"{'match_many':>15}: {batch_s * 1e3:.1f} ms for {len(queries)} tags")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Tiny synthetic fixture: dataset, LightGBM and XGBoost models and encoder for offline benchmarks.
+
+Disease labels are taken from description.csv so recommendation lookups hit
+real rows; symptom names are synthetic.
+"""
+import csv
+import os
+import shutil
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INFO_CSVS = ["description.csv", "precautions.csv", "medications.csv", "diets.csv", "workout.csv",
+             "symptom_synonyms.csv"]
+WORDS = ["sharp", "burning", "upper", "lower", "abdominal", "chest", "back", "joint", "muscle", "skin", "eye",
+         "ear", "throat", "head", "pain", "swelling", "stiffness", "itching", "bleeding", "weakness", "cramps"]
+
+
+def symptom_names(n, seed=0):
+    rng = np.random.default_rng(seed)
+    names = {"sharp abdominal pain", "headache", "fever", "cough", "nausea", "vomiting", "fatigue", "dizziness"}
+    while len(names) < n:
+        names.add(" ".join(rng.choice(WORDS, size=rng.integers(2, 4), replace=False)))
+    return sorted(names)
+
+
+def disease_names(n):
+    with open(os.path.join(ROOT, "description.csv"), newline="", encoding="utf-8") as f:
+        return [row[0] for row in list(csv.reader(f))[1:n + 1]]
+
+
+def build_fixture(directory, n_symptoms=120, n_diseases=30, n_rows=6000, seed=0):
+    """Write a dataset, lgb_fast.pkl, xgb_fast.pkl, disease_encoder.pkl and the info CSVs into ``directory``."""
+    import joblib
+    import lightgbm as lgb
+    import pandas as pd
+    import xgboost as xgb
+    from sklearn.preprocessing import LabelEncoder
+
+    rng = np.random.default_rng(seed)
+    symptoms = symptom_names(n_symptoms, seed)
+    diseases = disease_names(n_diseases)
+    # Each disease has a handful of characteristic symptoms plus noise.
+    profiles = [rng.choice(n_symptoms, size=6, replace=False) for _ in diseases]
+    y = rng.integers(0, len(diseases), size=n_rows)
+    X = (rng.random((n_rows, n_symptoms)) < 0.01).astype(np.uint8)
+    for row, label in enumerate(y):
+        X[row, rng.choice(profiles[label], size=4, replace=False)] = 1
+
+    labels = np.array(diseases)[y]
+    le = LabelEncoder().fit(labels)
+    frame = pd.DataFrame(X, columns=symptoms)
+    model = lgb.LGBMClassifier(n_estimators=40, num_leaves=15, verbose=-1).fit(frame, le.transform(labels))
+    xgb_model = xgb.XGBClassifier(n_estimators=20, max_depth=4, n_jobs=1).fit(X, le.transform(labels))
+
+    os.makedirs(directory, exist_ok=True)
+    frame.insert(0, "diseases", labels)
+    frame.to_csv(os.path.join(directory, "Diseases_and_Symptoms_dataset.csv"), index=False)
+    joblib.dump(model, os.path.join(directory, "lgb_fast.pkl"))
+    joblib.dump(xgb_model, os.path.join(directory, "xgb_fast.pkl"))
+    joblib.dump(le, os.path.join(directory, "disease_encoder.pkl"))
+    for name in INFO_CSVS:
+        shutil.copy(os.path.join(ROOT, name), directory)
+    return {"symptoms": symptoms, "diseases": diseases, "profiles": [[symptoms[i] for i in p] for p in profiles]}
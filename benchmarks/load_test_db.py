@@ -0,0 +1,79 @@
+"""Load test for the users/ratings database layer.
+
+Simulates N concurrent sessions, each logging in, checking/adding a rating and
+reading the admin counters, against a scratch database. Passwords use a cheap
+PBKDF2 cost so the run measures SQLite; bench_login.py measures the KDF.
+
+Usage: python benchmarks/load_test_db.py [--sessions 32] [--iterations 200] [--users 1000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from predictncure import db
+from predictncure.credentials import Credentials, PasswordHasher
+
+CREDENTIALS = Credentials(PasswordHasher("pbkdf2-sha256:i=1000"), workers=os.cpu_count(), max_pending=1024)
+
+
+def seed(path, n_users):
+    for i in range(n_users):
+        db.create_user(f"user{i}", "secret1", f"user{i}@example.com", "user", path=path, credentials=CREDENTIALS)
+
+
+def session(path, n_users, iterations, seed_value, stats, lock):
+    rng = random.Random(seed_value)
+    ops = errors = 0
+    for _ in range(iterations):
+        i = rng.randrange(n_users)
+        try:
+            user = db.find_user(f"user{i}", "secret1", path=path, credentials=CREDENTIALS)
+            if not db.has_rated(user[0], path=path):
+                db.add_rating(user[0], rng.randint(1, 5), path=path)
+            db.count_users("user", path=path)
+            db.count_ratings(path=path)
+            ops += 4
+        except sqlite3.OperationalError:
+            errors += 1
+    with lock:
+        stats["ops"] += ops
+        stats["errors"] += errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.db")
+        seed(path, args.users)
+        stats = {"ops": 0, "errors": 0}
+        lock = threading.Lock()
+        threads = [threading.Thread(target=session, args=(path, args.users, args.iterations, n, stats, lock))
+                   for n in range(args.sessions)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        db.get_pool(path).close()
+
+    print(f"sessions={args.sessions} ops={stats['ops']} errors={stats['errors']} "
+          f"elapsed={elapsed:.2f}s throughput={stats['ops'] / elapsed:,.0f} ops/s")
+    if stats["errors"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""Benchmark suite and regression gate for the prediction pipeline.
+
+Builds a small synthetic fixture (see fixture.py) in a scratch directory and
+times each stage separately: cold and warm ``load_artifacts``, info table
+loading, symptom matching per tag (exact and fuzzy hits as separate stages),
+feature encoding, ``predict_proba`` (with an XGBoost single-row stage as a
+smoke run of the second backend), top-k decoding, recommendation lookup plus
+formatting, and the SQLite auth/rating queries. Each stage reports throughput and p50/p95/p99 latency.
+
+Every stage is timed in several rounds and ``gate_ms`` is the lowest
+per-round median. Timings also drift between processes (CPU frequency, cache
+and allocator layout), so the whole suite runs ``--runs`` times, each in a
+fresh interpreter, and each stage keeps its best run both in a check and
+with ``--update-baseline``. Some processes run a stage up to 2x slower for
+their whole lifetime, so a regression has to show up in every run to fail
+the gate; any stage whose best ``gate_ms`` is more than ``--tolerance``
+times slower than its baseline fails the run with exit code 1. Baselines
+are machine specific: refresh them with ``--update-baseline`` on the
+machine that runs the gate.
+
+Usage: python benchmarks/run_suite.py [--out results.json] [--baseline benchmarks/baseline.json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np
+
+from fixture import build_fixture
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+MIN_SAMPLES = 50
+
+
+def measure(fn, inputs, warmup=5, rounds=3):
+    """Time ``fn`` once per input in each of ``rounds``; returns latency percentiles (ms) and throughput."""
+    for item in inputs[:warmup]:
+        fn(item)
+    # Small input sets are cycled so every round has enough samples for a stable median.
+    inputs = list(inputs) * -(-MIN_SAMPLES // len(inputs)) if len(inputs) < MIN_SAMPLES else inputs
+    times, medians = [], []
+    for _ in range(rounds):
+        round_times = []
+        for item in inputs:
+            start = time.perf_counter()
+            fn(item)
+            round_times.append(time.perf_counter() - start)
+        medians.append(float(np.median(round_times)) * 1000)
+        times.extend(round_times)
+    t = np.array(times) * 1000
+    return {
+        "n": len(t),
+        "gate_ms": min(medians),
+        "p50_ms": float(np.percentile(t, 50)),
+        "p95_ms": float(np.percentile(t, 95)),
+        "p99_ms": float(np.percentile(t, 99)),
+        "throughput_per_s": float(len(t) / (t.sum() / 1000)) if t.sum() else float("inf"),
+    }
+
+
+def fresh_copy(src, names):
+    dst = tempfile.mkdtemp(prefix="pnc-cold-")
+    for name in names:
+        shutil.copy(os.path.join(src, name), dst)
+    return dst
+
+
+def run_suite(workdir, requests=500, seed=0):
+    from predictncure import db
+    from predictncure.autocomplete import load_synonyms
+    from predictncure.credentials import Credentials, PasswordHasher
+    from predictncure.helpers import normalize_key
+    from predictncure.knowledge import build_store, load_knowledge
+    from predictncure.predictor import match_symptoms
+    from predictncure.recommendations import Recommendations
+    from predictncure.resources import load_artifacts
+
+    fixture = build_fixture(workdir, seed=seed)
+    rng = random.Random(seed)
+    results = {}
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        base_files = sorted(os.listdir(workdir))
+
+        def cold_load(_):
+            path = fresh_copy(workdir, base_files)
+            os.chdir(path)
+            try:
+                load_artifacts()
+            finally:
+                os.chdir(workdir)
+                shutil.rmtree(path)
+
+        results["load_artifacts_cold"] = measure(cold_load, list(range(3)), warmup=0)
+        load_artifacts()
+        results["load_artifacts_warm"] = measure(lambda _: load_artifacts(), list(range(10)), warmup=1)
+        res = load_artifacts()
+
+        results["info_tables_build"] = measure(lambda _: build_store(), list(range(20)), warmup=1)
+        results["info_tables_load"] = measure(lambda _: load_knowledge(), list(range(50)))
+
+        tag_lists = []
+        for _ in range(requests):
+            profile = rng.choice(fixture["profiles"])
+            tags = rng.sample(profile, 3)
+            # Roughly a third of tags carry a typo so the fuzzy stage is exercised.
+            tag_lists.append([t if rng.random() < 0.66 else t[:-1] for t in tags])
+        tags = [t for tl in tag_lists for t in tl]
+        # Exact hits are dict lookups and would hide the fuzzy scorer in a pooled median, so time them apart.
+        exact_keys = {normalize_key(s) for s in [*res.symptom_cols, *load_synonyms(res.symptom_cols)]}
+        exact = [t for t in tags if normalize_key(t) in exact_keys]
+        fuzzy = [t for t in tags if normalize_key(t) not in exact_keys]
+        results["exact_match_per_tag"] = measure(res.matcher.match, exact[:requests])
+        results["fuzzy_match_per_tag"] = measure(res.matcher.match, fuzzy[:requests])
+
+        matched = [match_symptoms(res.matcher, tl)[0] for tl in tag_lists]
+        results["encode_single"] = measure(lambda m: res.encoder.encode([m]), matched)
+        batches = [matched[i:i + 100] for i in range(0, len(matched), 100)]
+        results["encode_batch_100"] = measure(res.encoder.encode, batches, warmup=1)
+
+        rows = [res.encoder.encode([m]) for m in matched]
+        results["predict_proba_single"] = measure(res.model.predict_proba, rows)
+        encoded_batches = [res.encoder.encode(b) for b in batches]
+        results["predict_proba_batch_100"] = measure(res.model.predict_proba, encoded_batches, warmup=1)
+        # The fixture's XGBoost model goes through the same loader and fast path as a smoke run.
+        xgb_res = load_artifacts(model_files=["xgb_fast.pkl"])
+        results["predict_proba_single_xgb"] = measure(xgb_res.model.predict_proba,
+                                                      [xgb_res.encoder.encode([m]) for m in matched])
+
+        probs = [res.model.predict_proba(r) for r in rows]
+        results["topk_decode_single"] = measure(res.ranker.rank_matrix, probs)
+        prob_batches = [res.model.predict_proba(b) for b in encoded_batches]
+        results["topk_decode_batch_100"] = measure(res.ranker.rank_matrix, prob_batches, warmup=1)
+
+        diseases = [r["primary"] for p in probs for r in res.ranker.rank_matrix(p)]
+        results["recommendations_lookup"] = measure(res.recommendations.get, diseases)
+        results["recommendations_build"] = measure(lambda _: Recommendations(res.le.classes_, res.info),
+                                                   list(range(50)), warmup=1)
+
+        # A cheap KDF keeps the db stages about SQLite; bench_login.py covers password hashing.
+        credentials = Credentials(PasswordHasher("pbkdf2-sha256:i=1000"))
+        db_path = os.path.join(workdir, "bench.db")
+        for i in range(500):
+            db.create_user(f"user{i}", "secret1", f"user{i}@example.com", "user", path=db_path,
+                           credentials=credentials)
+        for i in range(250):
+            db.add_rating(i + 1, rng.randint(1, 5), path=db_path)
+        users = [rng.randrange(500) for _ in range(requests)]
+        results["db_login"] = measure(
+            lambda i: db.find_user(f"user{i}", "secret1", path=db_path, credentials=credentials), users)
+        results["db_has_rated"] = measure(lambda i: db.has_rated(i + 1, path=db_path), users)
+        results["db_admin_summary"] = measure(lambda _: db.rating_summary(path=db_path), users[:100])
+        db.get_pool(db_path).close()
+    finally:
+        os.chdir(cwd)
+    return results
+
+
+def run_once(requests, out):
+    """Run the suite in a fresh interpreter and return its stages."""
+    subprocess.run([sys.executable, os.path.abspath(__file__), "--single", "--requests", str(requests),
+                    "--out", out], check=True, stdout=subprocess.DEVNULL)
+    with open(out, encoding="utf-8") as f:
+        return json.load(f)["stages"]
+
+
+def best_runs(runs):
+    """Per stage, the run with the lowest ``gate_ms``."""
+    return {stage: min((run[stage] for run in runs), key=lambda r: r["gate_ms"]) for stage in runs[0]}
+
+
+def compare(results, baseline, tolerance, min_delta_ms=0.1):
+    """Stages whose ``gate_ms`` regressed beyond ``tolerance`` x baseline.
+
+    Stages well under a millisecond are noisy, so a regression must also
+    exceed the baseline by at least ``min_delta_ms``.
+    """
+    regressions = []
+    for stage, base in baseline.get("stages", {}).items():
+        current = results.get(stage)
+        if current is None:
+            continue
+        limit = max(base["gate_ms"] * tolerance, base["gate_ms"] + min_delta_ms)
+        if current["gate_ms"] > limit:
+            regressions.append((stage, base["gate_ms"], current["gate_ms"]))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--min-delta-ms", type=float, default=0.1)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=5, help="suite runs, each in a fresh process")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    logging.getLogger("predictncure").setLevel(logging.ERROR)
+
+    if args.single:
+        with tempfile.TemporaryDirectory(prefix="pnc-bench-") as workdir:
+            stages = run_suite(workdir, args.requests)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"stages": stages}, f)
+        return
+
+    with tempfile.TemporaryDirectory(prefix="pnc-runs-") as tmp:
+        runs = [run_once(args.requests, os.path.join(tmp, f"run{i}.json")) for i in range(max(1, args.runs))]
+    stages = best_runs(runs)
+    report = {"python": platform.python_version(), "machine": platform.machine(), "stages": stages}
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'stage':<26}{'gate ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'ops/s':>14}")
+    for stage, r in stages.items():
+        print(f"{stage:<26}{r['gate_ms']:>10.3f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}{r['p99_ms']:>10.3f}"
+              f"{r['throughput_per_s']:>14,.0f}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        regressions = compare(stages, json.load(f), args.tolerance, args.min_delta_ms)
+    for stage, base, now in regressions:
+        print(f"REGRESSION {stage}: {base:.3f} ms -> {now:.3f} ms (> {args.tolerance}x)")
+    if regressions:
+        sys.exit(1)
+    print(f"No stage slower than {args.tolerance}x its baseline in the best of {len(runs)} runs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Core prediction, data and recommendation logic shared by the Streamlit app and tools."""
@@ -0,0 +1,186 @@
+"""Artifact manager for the model files and dataset that are not kept in git.
+
+``artifacts.json`` lists each file with its download URL and, once pinned, its
+size and sha256. Downloads run concurrently into ``<name>.part`` files that
+are resumed on the next attempt, are checked against the manifest, and are
+then renamed into place, so other workers never see a half-written file. A
+lock file keeps two processes from downloading the same artifact at once.
+
+Set ``PREDICTNCURE_ARTIFACT_URL`` to fetch from another server (for example
+``python -m http.server`` over a directory of artifacts) instead of the URLs
+in the manifest.
+
+An entry without a size or sha256 is only checked for existence. The
+shipped manifest pins only ``disease_encoder.pkl``; the models and the
+dataset stay unverified until they are pinned from a trusted copy, and
+``fetch`` and ``warn_unpinned`` (called by the app before loading) log a
+warning each time one is downloaded or used.
+
+    python -m predictncure.artifacts pin   # record size/sha256 of local files
+"""
+import json
+import logging
+import os
+import shutil
+import sys
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from predictncure.schema import file_sha256
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_PATH = "artifacts.json"
+DEFAULT_MODEL = "lgb_fast.pkl"
+
+
+class ArtifactError(OSError):
+    pass
+
+
+def configured_model():
+    """Model file the app should load, from ``PREDICTNCURE_MODEL``."""
+    return os.environ.get("PREDICTNCURE_MODEL", DEFAULT_MODEL)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextmanager
+def _file_lock(path):
+    if fcntl is None:
+        yield
+        return
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _http_download(url, part_path, chunk_size=1 << 20):
+    """Download into ``part_path``, resuming from its current size when the server allows it."""
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+    try:
+        response = urllib.request.urlopen(request, timeout=60)
+    except urllib.error.HTTPError as e:
+        if e.code != 416 or not offset:
+            raise
+        # Nothing left to send: the part is complete if it has the server's length, otherwise start over.
+        if e.headers.get("Content-Range", "").rpartition("/")[2] == str(offset):
+            return
+        os.remove(part_path)
+        return _http_download(url, part_path, chunk_size)
+    with response:
+        resumed = offset and getattr(response, "status", 200) == 206
+        with open(part_path, "ab" if resumed else "wb") as f:
+            shutil.copyfileobj(response, f, chunk_size)
+
+
+def _drive_download(url, part_path):
+    import gdown
+    gdown.download(url, part_path, quiet=True, resume=True)
+
+
+class ArtifactManager:
+    def __init__(self, manifest=None, directory=".", base_url=None, workers=4):
+        self.manifest = manifest if manifest is not None else load_manifest()
+        self.directory = directory
+        self.base_url = base_url if base_url is not None else os.environ.get("PREDICTNCURE_ARTIFACT_URL")
+        self.workers = workers
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def url(self, name):
+        if self.base_url:
+            return f"{self.base_url.rstrip('/')}/{name}"
+        return self.manifest[name].get("url")
+
+    def verify(self, name, path=None, full=False):
+        """Check size (and sha256 when ``full``) against the manifest; unpinned fields are skipped."""
+        path = path or self.path(name)
+        entry = self.manifest.get(name, {})
+        if not os.path.exists(path):
+            return False
+        if entry.get("size") is not None and os.path.getsize(path) != entry["size"]:
+            return False
+        if full and entry.get("sha256") and file_sha256(path) != entry["sha256"]:
+            return False
+        return True
+
+    def missing(self, names):
+        return [name for name in names if not self.verify(name)]
+
+    def warn_unpinned(self, names):
+        """Log a warning for each of ``names`` whose manifest entry has no sha256."""
+        for name in names:
+            if not self.manifest.get(name, {}).get("sha256"):
+                logger.warning("Using %s unverified: it is not pinned in %s", name, MANIFEST_PATH)
+
+    def fetch(self, name):
+        """Make sure ``name`` is present and valid, downloading it if needed."""
+        if self.verify(name):
+            return self.path(name)
+        path = self.path(name)
+        with _file_lock(f"{path}.lock"):
+            # Another worker may have finished it while we waited for the lock.
+            if self.verify(name):
+                return path
+            url = self.url(name)
+            if not url:
+                raise ArtifactError(f"{name} is missing and has no download URL.")
+            part_path = f"{path}.part"
+            logger.info("Downloading %s from %s", name, url)
+            try:
+                if "drive.google.com" in url:
+                    _drive_download(url, part_path)
+                else:
+                    _http_download(url, part_path)
+            except Exception as e:
+                raise ArtifactError(f"Downloading {name} failed: {e}") from e
+            if not self.verify(name, part_path, full=True):
+                os.remove(part_path)
+                raise ArtifactError(f"Downloaded {name} does not match the manifest.")
+            if not self.manifest.get(name, {}).get("sha256"):
+                logger.warning("%s is not pinned in %s; run `python -m predictncure.artifacts pin`", name, MANIFEST_PATH)
+            os.replace(part_path, path)
+        return path
+
+    def fetch_all(self, names):
+        """Fetch several artifacts concurrently; raises the first failure."""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            return list(pool.map(self.fetch, names))
+
+
+def pin(path=MANIFEST_PATH, directory="."):
+    """Record the size and sha256 of every manifest entry present locally."""
+    manifest = load_manifest(path)
+    for name, entry in manifest.items():
+        local = os.path.join(directory, name)
+        if os.path.exists(local):
+            entry["size"] = os.path.getsize(local)
+            entry["sha256"] = file_sha256(local)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["pin"]:
+        pin()
+    else:
+        ArtifactManager().fetch_all(sys.argv[1:] or [configured_model()])
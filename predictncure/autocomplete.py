@@ -0,0 +1,99 @@
+"""Server-side symptom autocomplete.
+
+``SymptomIndex`` ranks symptom names for a typed prefix. Every symptom is
+indexed under its full name and under each word suffix ("abdominal pain",
+"pain"), and lay terms from ``symptom_synonyms.csv`` ("tummy ache") are
+indexed as extra names of their symptom. Keys are kept in one sorted list
+searched with ``bisect``, which works like a flattened trie; results for
+short prefixes are memoized in a bounded LRU.
+"""
+import bisect
+import csv
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from predictncure.helpers import normalize_key
+
+logger = logging.getLogger(__name__)
+
+SYNONYMS_PATH = "symptom_synonyms.csv"
+
+# Lower ranks sort first: whole-name prefix, word prefix, then synonym matches.
+RANK_NAME, RANK_WORD, RANK_SYNONYM = 0, 1, 2
+
+
+def load_synonyms(symptom_cols, path=SYNONYMS_PATH):
+    """``{lay term: symptom}`` for rows whose symptom is one of ``symptom_cols``."""
+    if not os.path.exists(path):
+        return {}
+    by_key = {normalize_key(sym): sym for sym in symptom_cols}
+    synonyms, unknown = {}, set()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            term = (row.get("term") or "").strip().lower()
+            sym = by_key.get(normalize_key(row.get("symptom") or ""))
+            if not term:
+                continue
+            if sym is None:
+                unknown.add(row.get("symptom"))
+                continue
+            synonyms[term] = sym
+    if unknown:
+        logger.info("Ignoring synonyms for %d symptoms not in the schema: %s", len(unknown), sorted(unknown)[:10])
+    return synonyms
+
+
+class SymptomIndex:
+    def __init__(self, symptom_cols, synonyms=None, memo_prefix_len=3, memo_size=4096):
+        self.symptom_cols = list(symptom_cols)
+        self.memo_prefix_len = memo_prefix_len
+        self.memo_size = memo_size
+        order = {sym: i for i, sym in enumerate(sorted(self.symptom_cols, key=lambda s: (len(s), s)))}
+        entries = set()
+        for sym in self.symptom_cols:
+            self._add(entries, sym.lower(), sym, RANK_NAME, RANK_WORD, order[sym])
+        for term, sym in (synonyms or {}).items():
+            self._add(entries, term.lower(), sym, RANK_SYNONYM, RANK_SYNONYM, order[sym])
+        self._entries = sorted(entries)
+        self._keys = [e[0] for e in self._entries]
+        self._memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+
+    @staticmethod
+    def _add(entries, text, sym, first_rank, word_rank, order):
+        words = text.split()
+        entries.add((text, first_rank, order, sym))
+        for i in range(1, len(words)):
+            entries.add((" ".join(words[i:]), word_rank, order, sym))
+
+    def suggest(self, prefix, limit=10):
+        """Up to ``limit`` symptom names for ``prefix``, best first."""
+        prefix = " ".join(prefix.lower().split())
+        if not prefix or limit < 1:
+            return []
+        memoize = len(prefix) <= self.memo_prefix_len
+        key = (prefix, limit)
+        if memoize:
+            with self._memo_lock:
+                hit = self._memo.get(key)
+                if hit is not None:
+                    self._memo.move_to_end(key)
+                    return hit
+        lo = bisect.bisect_left(self._keys, prefix)
+        hi = bisect.bisect_left(self._keys, prefix + "\uffff", lo)
+        best = {}
+        for _, rank, order, sym in self._entries[lo:hi]:
+            score = (rank, order)
+            if sym not in best or score < best[sym]:
+                best[sym] = score
+        result = sorted(best, key=best.get)[:limit]
+        if memoize:
+            with self._memo_lock:
+                self._memo[key] = result
+                if len(self._memo) > self.memo_size:
+                    self._memo.popitem(last=False)
+        return result
+
+    __call__ = suggest
@@ -0,0 +1,84 @@
+"""Versioned model bundles.
+
+A bundle is a directory holding a model, its label encoder and the symptom
+schema they were trained with, plus ``bundle.json`` recording the format
+version, sizes and SHA-256 checksums of every file and how the model was
+built. ``load_artifacts(bundle=...)`` (or ``PREDICTNCURE_BUNDLE``) loads one
+instead of the loose files in the working directory.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import joblib
+
+from predictncure.schema import SCHEMA_PATH, build_schema, file_sha256
+
+BUNDLE_FORMAT = 1
+MANIFEST = "bundle.json"
+MODEL_FILE = "lgb_fast.pkl"
+ENCODER_FILE = "disease_encoder.pkl"
+
+
+def write_bundle(out_dir, model, le, header_path, info=None):
+    """Write a bundle under ``out_dir/<version>`` atomically and return its path.
+
+    ``header_path`` is a CSV whose header gives the model's symptom columns;
+    ``info`` is stored in the manifest as-is (dataset, parameters, timings).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix=".bundle-", dir=out_dir)
+    try:
+        model_path = os.path.join(tmp, MODEL_FILE)
+        enc_path = os.path.join(tmp, ENCODER_FILE)
+        joblib.dump(model, model_path)
+        joblib.dump(le, enc_path)
+        schema = build_schema(header_path, {"model": model_path, "encoder": enc_path},
+                              os.path.join(tmp, SCHEMA_PATH))
+        files = {}
+        for name in (MODEL_FILE, ENCODER_FILE, SCHEMA_PATH):
+            path = os.path.join(tmp, name)
+            files[name] = {"size": os.path.getsize(path), "sha256": file_sha256(path)}
+        version = time.strftime("%Y%m%d-%H%M%S") + "-" + schema["checksum"][:8]
+        manifest = {
+            "format": BUNDLE_FORMAT,
+            "version": version,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "model": MODEL_FILE,
+            "encoder": ENCODER_FILE,
+            "schema": SCHEMA_PATH,
+            "files": files,
+            **(info or {}),
+        }
+        with open(os.path.join(tmp, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1)
+        final = os.path.join(out_dir, version)
+        os.replace(tmp, final)
+        return final
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def load_bundle(path):
+    """Read and verify ``bundle.json``; returns the manifest with absolute file paths.
+
+    Raises FileNotFoundError for missing files and ValueError for an unknown
+    format or a checksum mismatch.
+    """
+    manifest_path = os.path.join(path, MANIFEST)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"Not a model bundle: {manifest_path} not found.")
+    with open(manifest_path, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"Unsupported bundle format {manifest.get('format')!r} in {path}.")
+    for name, entry in manifest["files"].items():
+        file_path = os.path.join(path, name)
+        if not os.path.exists(file_path):
+            raise FileNotFoundError(f"Bundle file missing: {file_path}")
+        if os.path.getsize(file_path) != entry["size"] or file_sha256(file_path) != entry["sha256"]:
+            raise ValueError(f"Checksum mismatch for {file_path}.")
+    return {**manifest, **{key: os.path.join(path, manifest[key]) for key in ("model", "encoder", "schema")}}
@@ -0,0 +1,148 @@
+"""Password hashing with a versioned format and a bounded verification pool.
+
+Hashes look like ``$scrypt-v1$n=16384,r=8,p=1$<salt>$<key>`` or
+``$pbkdf2-sha256-v1$i=600000$<salt>$<key>`` (salt and key are unpadded
+base64). The scheme and cost come from ``PREDICTNCURE_PASSWORD_HASH``, e.g.
+``scrypt:n=32768,r=8,p=1`` or ``pbkdf2-sha256:i=600000``. A stored hash whose
+scheme or parameters differ from the configured ones verifies as usual and
+is reported for rehashing, as are legacy plaintext passwords, so accounts move
+to the current cost on their next login.
+
+KDF work runs on a small thread pool (``PREDICTNCURE_AUTH_WORKERS``) with a
+cap on queued requests; when the queue stays full for ``timeout`` seconds
+``CredentialsBusy`` is raised instead of letting a login storm take every
+core from prediction requests.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from predictncure.metrics import span
+
+DEFAULT_HASH = "scrypt"
+DEFAULT_PARAMS = {"scrypt": "n=16384,r=8,p=1", "pbkdf2-sha256": "i=600000"}
+SALT_BYTES = 16
+KEY_BYTES = 32
+SCHEMES = {"scrypt": "scrypt-v1", "pbkdf2-sha256": "pbkdf2-sha256-v1"}
+
+
+class CredentialsBusy(RuntimeError):
+    """Too many password operations are already queued."""
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii").rstrip("=")
+
+
+def _unb64(text):
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+def _parse_params(text):
+    return {k: int(v) for k, v in (item.split("=", 1) for item in text.split(","))}
+
+
+def _format_params(params):
+    return ",".join(f"{k}={v}" for k, v in params.items())
+
+
+def is_hash(stored):
+    """True for values in one of our hash formats; anything else is a legacy plaintext password."""
+    return any(stored.startswith(f"${scheme}$") for scheme in SCHEMES.values())
+
+
+class PasswordHasher:
+    def __init__(self, config=None):
+        config = config or os.environ.get("PREDICTNCURE_PASSWORD_HASH", DEFAULT_HASH)
+        scheme, _, params = config.partition(":")
+        if scheme not in SCHEMES:
+            raise ValueError(f"Unknown password hash scheme: {scheme!r}")
+        self.scheme = scheme
+        self.params = _parse_params(params or DEFAULT_PARAMS[scheme])
+        self.prefix = f"${SCHEMES[scheme]}${_format_params(self.params)}$"
+
+    def _derive(self, scheme, params, password, salt):
+        password = password.encode("utf-8")
+        if scheme == "scrypt-v1":
+            n, r, p = params["n"], params["r"], params["p"]
+            return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p, maxmem=256 * r * (n + p + 2),
+                                  dklen=KEY_BYTES)
+        if scheme == "pbkdf2-sha256-v1":
+            return hashlib.pbkdf2_hmac("sha256", password, salt, params["i"], dklen=KEY_BYTES)
+        raise ValueError(f"Unknown password hash scheme: {scheme!r}")
+
+    def hash(self, password):
+        salt = secrets.token_bytes(SALT_BYTES)
+        key = self._derive(SCHEMES[self.scheme], self.params, password, salt)
+        return f"{self.prefix}{_b64(salt)}${_b64(key)}"
+
+    def verify(self, password, stored):
+        """True if ``password`` matches ``stored`` (a hash, or a legacy plaintext value)."""
+        if not is_hash(stored):
+            return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+        try:
+            _, scheme, params, salt, key = stored.split("$")
+            expected = _unb64(key)
+            derived = self._derive(scheme, _parse_params(params), password, _unb64(salt))
+        except (KeyError, ValueError):
+            return False
+        return hmac.compare_digest(derived, expected)
+
+    def needs_rehash(self, stored):
+        return not stored.startswith(self.prefix)
+
+
+class Credentials:
+    """Runs a PasswordHasher on a bounded pool so callers never queue without limit."""
+
+    def __init__(self, hasher=None, workers=None, max_pending=None, timeout=10.0):
+        self.hasher = hasher or PasswordHasher()
+        workers = workers or int(os.environ.get("PREDICTNCURE_AUTH_WORKERS", "2"))
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="auth")
+        self._pending = threading.BoundedSemaphore(max_pending or workers * 8)
+        # Unknown usernames are checked against this so they cost as much as a wrong password.
+        self._dummy = None
+
+    def _run(self, name, fn, *args):
+        if not self._pending.acquire(timeout=self.timeout):
+            raise CredentialsBusy("Too many login attempts in progress; please try again.")
+        try:
+            with span(name):
+                return self._executor.submit(fn, *args).result()
+        finally:
+            self._pending.release()
+
+    def hash(self, password):
+        return self._run("auth.hash", self.hasher.hash, password)
+
+    def verify(self, password, stored):
+        """``(ok, new_hash)``; ``new_hash`` is set when ``stored`` should be replaced."""
+        if stored is None:
+            if self._dummy is None:
+                self._dummy = self.hash(secrets.token_hex(8))
+            self._run("auth.verify", self.hasher.verify, password, self._dummy)
+            return False, None
+        if not self._run("auth.verify", self.hasher.verify, password, stored):
+            return False, None
+        if self.hasher.needs_rehash(stored):
+            return True, self.hash(password)
+        return True, None
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_credentials():
+    """Process-wide Credentials, so every Streamlit session shares one pool."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = Credentials()
+    return _default
@@ -0,0 +1,269 @@
+"""Data access for the users/ratings database.
+
+Connections come from a small per-process pool. Each one is opened once in
+WAL mode with a busy timeout, so concurrent Streamlit sessions can read while
+one writes instead of failing with "database is locked". The schema is
+brought up to date once per process through numbered migrations tracked in
+``PRAGMA user_version``.
+
+Dashboard aggregates (user counts per role, rating histogram and per-day
+series) live in summary tables kept current by triggers, so reading them
+costs the same however large the ratings table grows. Table views page with
+keyset pagination on ``id``.
+
+Passwords are stored as salted KDF hashes (see ``credentials``); hashing
+happens before a pooled connection is borrowed, so slow KDFs never hold one.
+"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from predictncure.credentials import default_credentials
+from predictncure.metrics import timed
+
+DB_PATH = "database.db"
+BUSY_TIMEOUT = 10.0
+
+MIGRATIONS = [
+    [
+        '''CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT UNIQUE,
+                password TEXT,
+                email TEXT,
+                role TEXT)''',
+        '''CREATE TABLE IF NOT EXISTS ratings (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER,
+                rating INTEGER,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)''',
+    ],
+    [
+        "CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)",
+        "CREATE INDEX IF NOT EXISTS idx_users_role ON users(role)",
+        "CREATE INDEX IF NOT EXISTS idx_ratings_user_id ON ratings(user_id)",
+    ],
+    [
+        "CREATE TABLE IF NOT EXISTS user_counts (role TEXT PRIMARY KEY, count INTEGER NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS rating_histogram (rating INTEGER PRIMARY KEY, count INTEGER NOT NULL)",
+        '''CREATE TABLE IF NOT EXISTS rating_daily (
+                day TEXT PRIMARY KEY,
+                count INTEGER NOT NULL,
+                total INTEGER NOT NULL)''',
+        '''CREATE TRIGGER IF NOT EXISTS users_count_insert AFTER INSERT ON users BEGIN
+                INSERT INTO user_counts(role, count) VALUES (NEW.role, 1)
+                    ON CONFLICT(role) DO UPDATE SET count = count + 1;
+            END''',
+        '''CREATE TRIGGER IF NOT EXISTS users_count_delete AFTER DELETE ON users BEGIN
+                UPDATE user_counts SET count = count - 1 WHERE role IS OLD.role;
+            END''',
+        '''CREATE TRIGGER IF NOT EXISTS users_count_role AFTER UPDATE OF role ON users
+            WHEN OLD.role IS NOT NEW.role BEGIN
+                UPDATE user_counts SET count = count - 1 WHERE role IS OLD.role;
+                INSERT INTO user_counts(role, count) VALUES (NEW.role, 1)
+                    ON CONFLICT(role) DO UPDATE SET count = count + 1;
+            END''',
+        '''CREATE TRIGGER IF NOT EXISTS ratings_summary_insert AFTER INSERT ON ratings BEGIN
+                INSERT INTO rating_histogram(rating, count) VALUES (NEW.rating, 1)
+                    ON CONFLICT(rating) DO UPDATE SET count = count + 1;
+                INSERT INTO rating_daily(day, count, total) VALUES (date(NEW.created_at), 1, NEW.rating)
+                    ON CONFLICT(day) DO UPDATE SET count = count + 1, total = total + NEW.rating;
+            END''',
+        '''CREATE TRIGGER IF NOT EXISTS ratings_summary_delete AFTER DELETE ON ratings BEGIN
+                UPDATE rating_histogram SET count = count - 1 WHERE rating = OLD.rating;
+                UPDATE rating_daily SET count = count - 1, total = total - OLD.rating
+                    WHERE day = date(OLD.created_at);
+            END''',
+        "DELETE FROM user_counts",
+        "INSERT INTO user_counts SELECT role, COUNT(*) FROM users GROUP BY role",
+        "DELETE FROM rating_histogram",
+        "INSERT INTO rating_histogram SELECT rating, COUNT(*) FROM ratings GROUP BY rating",
+        "DELETE FROM rating_daily",
+        "INSERT INTO rating_daily SELECT date(created_at), COUNT(*), SUM(rating) FROM ratings GROUP BY date(created_at)",
+    ],
+]
+
+
+def migrate(path=DB_PATH):
+    """Apply pending migrations; safe to call from several processes at once."""
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("BEGIN IMMEDIATE")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for statements in MIGRATIONS[version:]:
+            for sql in statements:
+                conn.execute(sql)
+        conn.execute(f"PRAGMA user_version = {len(MIGRATIONS)}")
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+
+class ConnectionPool:
+    def __init__(self, path=DB_PATH, size=8, timeout=BUSY_TIMEOUT):
+        self.path = path
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.timeout * 1000)}")
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success and rolls back on error."""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(path=DB_PATH):
+    """Process-wide pool for ``path``; the first call also runs migrations."""
+    pool = _pools.get(path)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(path)
+            if pool is None:
+                migrate(path)
+                pool = _pools[path] = ConnectionPool(path)
+    return pool
+
+
+def connection(path=DB_PATH):
+    return get_pool(path).connection()
+
+
+# ---------------- USERS ----------------
+@timed("db.find_user")
+def find_user(username, password, path=DB_PATH, credentials=None):
+    """The user row if ``password`` is right, else None; outdated or plaintext hashes are upgraded."""
+    credentials = credentials or default_credentials()
+    with connection(path) as conn:
+        user = conn.execute("SELECT * FROM users WHERE username=?", (username,)).fetchone()
+    ok, new_hash = credentials.verify(password, user[2] if user else None)
+    if not ok:
+        return None
+    if new_hash:
+        with connection(path) as conn:
+            conn.execute("UPDATE users SET password=? WHERE id=? AND password=?", (new_hash, user[0], user[2]))
+    return user
+
+
+@timed("db.create_user")
+def create_user(username, password, email, role="user", path=DB_PATH, credentials=None):
+    """Insert a user; raises sqlite3.IntegrityError if the username is taken."""
+    hashed = (credentials or default_credentials()).hash(password)
+    with connection(path) as conn:
+        conn.execute("INSERT INTO users (username,password,email,role) VALUES (?,?,?,?)",
+                     (username, hashed, email, role))
+
+
+@timed("db.reset_password")
+def reset_password(email, password, path=DB_PATH, credentials=None):
+    """Set a new password for ``email``; returns False if no user has that email."""
+    hashed = (credentials or default_credentials()).hash(password)
+    with connection(path) as conn:
+        cur = conn.execute("UPDATE users SET password=? WHERE email=?", (hashed, email))
+        return cur.rowcount > 0
+
+
+@timed("db.count_users")
+def count_users(role="user", path=DB_PATH):
+    with connection(path) as conn:
+        row = conn.execute("SELECT count FROM user_counts WHERE role=?", (role,)).fetchone()
+        return row[0] if row else 0
+
+
+@timed("db.list_users")
+def list_users(limit=50, after_id=None, path=DB_PATH):
+    """One page of ``(id, username, email, role)`` rows in id order, starting after ``after_id``."""
+    with connection(path) as conn:
+        return conn.execute(
+            "SELECT id,username,email,role FROM users WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id or 0, limit),
+        ).fetchall()
+
+
+# ---------------- RATINGS ----------------
+@timed("db.has_rated")
+def has_rated(user_id, path=DB_PATH):
+    with connection(path) as conn:
+        return conn.execute("SELECT 1 FROM ratings WHERE user_id=? LIMIT 1", (user_id,)).fetchone() is not None
+
+
+@timed("db.add_rating")
+def add_rating(user_id, rating, path=DB_PATH):
+    with connection(path) as conn:
+        conn.execute("INSERT INTO ratings(user_id,rating) VALUES (?,?)", (user_id, rating))
+
+
+@timed("db.count_ratings")
+def count_ratings(path=DB_PATH):
+    with connection(path) as conn:
+        return conn.execute("SELECT COALESCE(SUM(count), 0) FROM rating_histogram").fetchone()[0]
+
+
+@timed("db.list_ratings")
+def list_ratings(limit=50, after_id=None, path=DB_PATH):
+    """One page of ``(id, user_id, rating, created_at)`` rows, newest first, older than ``after_id``."""
+    with connection(path) as conn:
+        if after_id is None:
+            return conn.execute(
+                "SELECT id,user_id,rating,created_at FROM ratings ORDER BY id DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return conn.execute(
+            "SELECT id,user_id,rating,created_at FROM ratings WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
+
+
+@timed("db.rating_summary")
+def rating_summary(days=90, path=DB_PATH):
+    """Count, mean, histogram and the last ``days`` of per-day counts/means, read from summary tables."""
+    with connection(path) as conn:
+        histogram = dict(conn.execute("SELECT rating, count FROM rating_histogram WHERE count > 0 ORDER BY rating"))
+        daily = conn.execute(
+            "SELECT day, count, total FROM rating_daily WHERE count > 0 ORDER BY day DESC LIMIT ?", (days,)
+        ).fetchall()
+    count = sum(histogram.values())
+    total = sum(rating * n for rating, n in histogram.items())
+    return {
+        "count": count,
+        "mean": total / count if count else None,
+        "histogram": histogram,
+        "daily": [(day, n, t / n) for day, n, t in reversed(daily)],
+    }
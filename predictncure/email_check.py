@@ -0,0 +1,129 @@
+"""Cached, time-bounded email domain validation.
+
+Lookups run on a small thread pool and the caller waits at most ``timeout``
+seconds. A lookup that overruns keeps going in the background and its result
+is cached for the next attempt. Results are kept in a bounded LRU cache with
+separate TTLs for domains that resolve and domains that do not. The resolver
+is any callable ``domain -> bool``, so tests can pass a local stub.
+"""
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+try:
+    import dns.resolver
+except Exception:
+    dns = None
+
+KNOWN_DOMAINS = frozenset({
+    "gmail.com", "googlemail.com", "yahoo.com", "outlook.com", "hotmail.com", "live.com", "icloud.com",
+})
+
+
+def dns_resolver(domain, lifetime=5.0):
+    """True if the domain has an MX record or at least resolves to an address."""
+    if dns:
+        try:
+            dns.resolver.resolve(domain, 'MX', lifetime=lifetime)
+            return True
+        except Exception:
+            pass
+    try:
+        socket.gethostbyname(domain)
+        return True
+    except Exception:
+        return False
+
+
+class StaticResolver:
+    """Offline resolver: answers from a set of valid domains, optionally after a delay."""
+
+    def __init__(self, valid_domains=(), delay=0.0):
+        self.valid_domains = set(valid_domains)
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, domain):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        return domain in self.valid_domains
+
+
+class DomainValidator:
+    def __init__(self, resolver=dns_resolver, timeout=2.0, positive_ttl=24 * 3600, negative_ttl=300,
+                 max_size=10000, workers=4, known_domains=KNOWN_DOMAINS, clock=time.monotonic):
+        self.resolver = resolver
+        self.timeout = timeout
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self.known_domains = frozenset(known_domains)
+        self.clock = clock
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="email-dns")
+
+    def _cached(self, domain):
+        with self._lock:
+            entry = self._cache.get(domain)
+            if entry is None:
+                return None
+            ok, expires = entry
+            if expires <= self.clock():
+                del self._cache[domain]
+                return None
+            self._cache.move_to_end(domain)
+            return ok
+
+    def _store(self, domain, ok):
+        ttl = self.positive_ttl if ok else self.negative_ttl
+        with self._lock:
+            self._cache[domain] = (ok, self.clock() + ttl)
+            self._cache.move_to_end(domain)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+
+    def _resolve(self, domain):
+        try:
+            ok = bool(self.resolver(domain))
+        except Exception:
+            ok = False
+        self._store(domain, ok)
+        with self._lock:
+            self._pending.pop(domain, None)
+        return ok
+
+    def check(self, domain):
+        """Return ``(ok, message)`` within the latency budget."""
+        domain = domain.strip().lower().rstrip(".")
+        if domain in self.known_domains:
+            return True, ""
+        ok = self._cached(domain)
+        if ok is None:
+            with self._lock:
+                future = self._pending.get(domain)
+                if future is None:
+                    future = self._pending[domain] = self._pool.submit(self._resolve, domain)
+            try:
+                ok = future.result(timeout=self.timeout)
+            except TimeoutError:
+                return False, "Email domain could not be verified in time. Please try again."
+        return (True, "") if ok else (False, "Email domain does not resolve.")
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_validator():
+    """Process-wide validator, so the cache survives Streamlit reruns."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = DomainValidator()
+    return _default
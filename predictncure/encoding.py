@@ -0,0 +1,69 @@
+"""Symptom feature encoding.
+
+A symptom -> column index map is built once; single requests are written into
+a dense float32 row and batches become a CSR matrix, which LightGBM accepts
+without densifying. XGBoost reads entries absent from a CSR matrix as
+missing rather than zero, so ``FeatureEncoder.for_model`` keeps batches dense
+for XGBoost models.
+"""
+import numpy as np
+from scipy import sparse
+
+from predictncure.model_io import model_library
+
+
+class FeatureEncoder:
+    def __init__(self, symptom_cols, dtype=np.float32, sparse=True):
+        self.symptom_cols = list(symptom_cols)
+        self.sparse = sparse
+        self.n_features = len(self.symptom_cols)
+        self.dtype = dtype
+        self.index = {sym: i for i, sym in enumerate(self.symptom_cols)}
+
+    @classmethod
+    def for_model(cls, model, symptom_cols, **kwargs):
+        """Encoder whose batch format suits ``model``: dense for XGBoost, CSR otherwise."""
+        return cls(symptom_cols, sparse=model_library(model) != "xgboost", **kwargs)
+
+    def column_indices(self, matched):
+        """Sorted, de-duplicated column indices of the matched symptoms."""
+        return sorted({self.index[sym] for sym in matched if sym in self.index})
+
+    def encode_into(self, matched, out):
+        """Write one row into a caller-owned buffer of length ``n_features``."""
+        out.fill(0)
+        out[self.column_indices(matched)] = 1
+        return out
+
+    def encode_one(self, matched):
+        """Dense ``(1, n_features)`` row for a single request."""
+        out = np.zeros((1, self.n_features), dtype=self.dtype)
+        self.encode_into(matched, out[0])
+        return out
+
+    def encode_batch(self, matched_lists):
+        """CSR matrix with one row per symptom list."""
+        indptr = [0]
+        indices = []
+        for matched in matched_lists:
+            indices.extend(self.column_indices(matched))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=self.dtype)
+        return sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(matched_lists), self.n_features),
+        )
+
+    def encode_dense(self, matched_lists):
+        out = np.zeros((len(matched_lists), self.n_features), dtype=self.dtype)
+        for row, matched in enumerate(matched_lists):
+            out[row, self.column_indices(matched)] = 1
+        return out
+
+    def encode(self, matched_lists):
+        """Dense row for a single list, CSR for batches unless the encoder is dense-only."""
+        if len(matched_lists) == 1:
+            return self.encode_one(matched_lists[0])
+        if not self.sparse:
+            return self.encode_dense(matched_lists)
+        return self.encode_batch(matched_lists)
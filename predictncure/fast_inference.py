@@ -0,0 +1,227 @@
+"""Fast single-row inference.
+
+``FastModel`` wraps the loaded model and keeps its ``predict_proba``
+interface. Batches go to the wrapped model unchanged. Single rows take a
+cheaper path:
+
+* ``booster``: LightGBM ``Booster.predict`` on the dense row, skipping the
+  sklearn wrapper's input validation.
+* ``inplace``: XGBoost ``inplace_predict``, skipping the wrapper and DMatrix
+  construction.
+* ``compiled`` (opt-in with ``compile=True`` or
+  ``PREDICTNCURE_COMPILED_FOREST=1``): LightGBM forests compiled into flat
+  NumPy node arrays. Symptom inputs are almost all zeros, so the leaf every
+  tree reaches for an all-zero row is precomputed, and a request only
+  re-walks the trees whose all-zero path splits on one of its active
+  symptoms. Building it means ``dump_model()`` and a Python pass over every
+  node, which takes seconds on large multiclass forests, so it is only used
+  when it also beats ``booster`` on timing.
+
+The chosen path is checked against the wrapped model on a few random sparse
+rows when the wrapper is built and dropped if any probability differs by more
+than ``tolerance``.
+"""
+import logging
+import os
+import re
+import time
+
+import numpy as np
+
+from predictncure.model_io import model_library
+
+logger = logging.getLogger(__name__)
+
+
+class UnsupportedModel(ValueError):
+    pass
+
+
+class CompiledForest:
+    """LightGBM ``dump_model()`` output as flat arrays for numerical splits."""
+
+    def __init__(self, dump, n_features=None):
+        objective = dump.get("objective", "")
+        if dump.get("average_output"):
+            raise UnsupportedModel("random forest mode")
+        if objective.startswith("multiclass ") or objective == "multiclass":
+            self.link = "softmax"
+            self.sigmoid = 1.0
+        elif objective.startswith("binary"):
+            self.link = "sigmoid"
+            match = re.search(r"sigmoid:([0-9.eE+-]+)", objective)
+            self.sigmoid = float(match.group(1)) if match else 1.0
+        else:
+            raise UnsupportedModel(f"objective '{objective}'")
+        self.n_classes = max(1, dump.get("num_tree_per_iteration", 1))
+        self.n_features = max(n_features or 0, dump["max_feature_idx"] + 1)
+
+        feature, threshold, left, right, default_left, zero_missing = [], [], [], [], [], []
+        leaf_value = []
+
+        def add(node):
+            if "leaf_value" in node:
+                leaf_value.append(node["leaf_value"])
+                return -len(leaf_value)
+            if node.get("decision_type", "<=") != "<=":
+                raise UnsupportedModel("categorical split")
+            idx = len(feature)
+            feature.append(node["split_feature"])
+            threshold.append(node["threshold"])
+            default_left.append(bool(node.get("default_left", True)))
+            zero_missing.append(node.get("missing_type") == "Zero")
+            left.append(0)
+            right.append(0)
+            left[idx] = add(node["left_child"])
+            right[idx] = add(node["right_child"])
+            return idx
+
+        roots = [add(info["tree_structure"]) for info in dump["tree_info"]]
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.zero_missing = np.asarray(zero_missing, dtype=bool)
+        self.leaf_value = np.asarray(leaf_value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.tree_class = np.arange(len(roots), dtype=np.int32) % self.n_classes
+
+        # Leaf reached by an all-zero row, and which trees each feature can redirect.
+        zero_leaf = np.empty(len(roots), dtype=np.int32)
+        trees_by_feature = [[] for _ in range(self.n_features)]
+        for t, node in enumerate(roots):
+            while node >= 0:
+                trees_by_feature[self.feature[node]].append(t)
+                node = self.left[node] if self._goes_left(node, 0.0) else self.right[node]
+            zero_leaf[t] = -node - 1
+        self.zero_leaf_value = self.leaf_value[zero_leaf]
+        self.base_raw = np.bincount(self.tree_class, weights=self.zero_leaf_value, minlength=self.n_classes)
+        self.trees_by_feature = [np.unique(np.asarray(t, dtype=np.int32)) for t in trees_by_feature]
+
+    def _goes_left(self, node, value):
+        if self.zero_missing[node] and value == 0:
+            return self.default_left[node]
+        return value <= self.threshold[node]
+
+    def raw_score(self, x):
+        active = np.flatnonzero(x)
+        if not len(active):
+            return self.base_raw.copy()
+        trees = np.unique(np.concatenate([self.trees_by_feature[f] for f in active]))
+        if not len(trees):
+            return self.base_raw.copy()
+        nodes = self.roots[trees].copy()
+        inner = nodes >= 0
+        while inner.any():
+            n = nodes[inner]
+            values = x[self.feature[n]]
+            go_left = np.where(self.zero_missing[n] & (values == 0), self.default_left[n], values <= self.threshold[n])
+            nodes[inner] = np.where(go_left, self.left[n], self.right[n])
+            inner = nodes >= 0
+        delta = self.leaf_value[-nodes - 1] - self.zero_leaf_value[trees]
+        return self.base_raw + np.bincount(self.tree_class[trees], weights=delta, minlength=self.n_classes)
+
+    def predict_proba_row(self, x):
+        raw = self.raw_score(np.asarray(x, dtype=np.float64).ravel())
+        if self.link == "softmax":
+            e = np.exp(raw - raw.max())
+            return e / e.sum()
+        p = 1.0 / (1.0 + np.exp(-self.sigmoid * raw[0]))
+        return np.array([1.0 - p, p])
+
+
+def _booster(model):
+    booster = getattr(model, "booster", None)
+    if booster is None:
+        booster = getattr(model, "booster_", None)
+    if booster is None and hasattr(model, "get_booster"):
+        booster = model.get_booster()
+    return booster
+
+
+def feature_count(model, booster, library):
+    """Input width of ``model``: ``n_features_in_`` when set, else the booster's own count."""
+    n = getattr(model, "n_features_in_", None)
+    if n:
+        return int(n)
+    if library == "xgboost":
+        return booster.num_features()
+    return booster.num_feature()
+
+
+class FastModel:
+    """``predict_proba`` front-end that routes single rows to the fastest verified path."""
+
+    def __init__(self, model, tolerance=1e-6, check_rows=8, seed=0, compile=None, n_features=None):
+        self.model = model
+        self.library = model_library(model)
+        self.booster = _booster(model)
+        self.n_features = n_features
+        self.forest = None
+        self.path = None
+        self._row = None
+        if self.booster is None:
+            return
+
+        candidates = {}
+        if self.library == "lightgbm":
+            candidates["booster"] = self._booster_row
+        elif self.library == "xgboost":
+            candidates["inplace"] = self._inplace_row
+        if not candidates:
+            return
+
+        if self.n_features is None:
+            self.n_features = feature_count(model, self.booster, self.library)
+        if compile is None:
+            compile = os.environ.get("PREDICTNCURE_COMPILED_FOREST") == "1"
+        if compile and self.library == "lightgbm":
+            try:
+                self.forest = CompiledForest(self.booster.dump_model(), self.n_features)
+                candidates["compiled"] = self._compiled_row
+            except UnsupportedModel as e:
+                logger.info("Not compiling LightGBM model: %s", e)
+
+        rng = np.random.default_rng(seed)
+        X = (rng.random((check_rows, self.n_features)) < 0.02).astype(np.float32)
+        expected = self.model.predict_proba(X)
+        timings = {}
+        for name, fn in candidates.items():
+            start = time.perf_counter()
+            actual = np.vstack([fn(X[i:i + 1]) for i in range(check_rows)])
+            elapsed = time.perf_counter() - start
+            if actual.shape != expected.shape or not np.allclose(actual, expected, rtol=0, atol=tolerance):
+                logger.warning("Fast inference path '%s' disagrees with the model; not using it", name)
+                continue
+            timings[name] = elapsed
+        if timings:
+            self.path = min(timings, key=timings.get)
+            self._row = candidates[self.path]
+        if self.path != "compiled":
+            self.forest = None
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def _booster_row(self, row):
+        probs = self.booster.predict(row)
+        return _two_class(probs)
+
+    def _inplace_row(self, row):
+        return _two_class(np.asarray(self.booster.inplace_predict(row)))
+
+    def _compiled_row(self, row):
+        return self.forest.predict_proba_row(row[0])[None, :]
+
+    def predict_proba(self, X):
+        if self._row is not None and getattr(X, "shape", (0,))[0] == 1:
+            row = X.toarray() if hasattr(X, "toarray") else np.asarray(X)
+            return self._row(row)
+        return self.model.predict_proba(X)
+
+
+def _two_class(probs):
+    if probs.ndim == 1:
+        probs = np.column_stack([1 - probs, probs])
+    return probs
@@ -0,0 +1,43 @@
+"""Small text helpers shared by the app and the prediction modules."""
+import ast
+import re
+
+
+def normalize_key(text: str) -> str:
+    if not text:
+        return ""
+    return re.sub(r'[\s_\-]+', '', text.lower().strip())
+
+
+def parse_items(text):
+    """Split a stored recommendation cell (a list literal or free text) into clean items."""
+    try:
+        parsed = ast.literal_eval(text)
+        items = parsed if isinstance(parsed, list) else [parsed]
+    except Exception:
+        items = re.split(r',|;|\.', str(text))
+    cleaned = []
+    for item in items:
+        item = str(item).strip().replace("[", "").replace("]", "").replace("'", "").replace('"', "")
+        if item:
+            cleaned.append(item)
+    return cleaned
+
+
+def clean_description_paragraph(text):
+    if not text:
+        return "No data available."
+    try:
+        parsed = ast.literal_eval(text)
+        if isinstance(parsed, list):
+            return " ".join(parsed)
+        return str(parsed)
+    except Exception:
+        return str(text)
+
+
+def clean_and_bullet(text):
+    if not text:
+        return "- No data"
+    cleaned = parse_items(text)
+    return "- No data" if not cleaned else "- " + "\n- ".join(cleaned)
@@ -0,0 +1,142 @@
+"""Consolidated knowledge store for the per-disease info tables.
+
+The five info CSVs are compiled into one SQLite file keyed by normalized
+disease name. Every value column is kept: tables with several value columns
+(Precaution_1..4) are stored as a list literal so they parse like the list
+cells of the other tables. The store records a fingerprint of each source CSV
+and is rebuilt automatically when any of them changes.
+
+    python -m predictncure.knowledge   # build or refresh knowledge.db
+"""
+import csv
+import hashlib
+import json
+import os
+import sqlite3
+
+from predictncure.helpers import normalize_key
+from predictncure.schema import file_sha256, fingerprint, fingerprint_matches
+
+KNOWLEDGE_PATH = "knowledge.db"
+STORE_VERSION = 1
+INFO_FILES = {
+    "description": "description.csv",
+    "precautions": "precautions.csv",
+    "medications": "medications.csv",
+    "diets": "diets.csv",
+    "workout": "workout.csv",
+}
+
+
+def read_source(path):
+    """Yield ``(key, value)`` for every row of an info CSV."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if len(header) < 2:
+            return
+        for row in reader:
+            if not row:
+                continue
+            values = [v.strip() for v in row[1:] if v.strip()]
+            if len(header) == 2:
+                value = values[0] if values else ""
+            else:
+                value = repr(values)
+            yield normalize_key(row[0]), value
+
+
+def build_store(sources=INFO_FILES, path=KNOWLEDGE_PATH):
+    """Compile the source CSVs into a fresh store, replacing ``path`` atomically."""
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("CREATE TABLE knowledge (disease TEXT, section TEXT, value TEXT, PRIMARY KEY (disease, section))")
+        conn.execute("CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT)")
+        sources_meta = {}
+        for section, src in sources.items():
+            if not os.path.exists(src):
+                continue
+            conn.executemany(
+                "INSERT OR REPLACE INTO knowledge VALUES (?,?,?)",
+                ((key, section, value) for key, value in read_source(src)),
+            )
+            sources_meta[section] = {"path": src, "sha256": file_sha256(src), **fingerprint(src)}
+        conn.execute("INSERT INTO meta VALUES ('version', ?)", (str(STORE_VERSION),))
+        conn.execute("INSERT INTO meta VALUES ('sources', ?)", (json.dumps(sources_meta),))
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+
+
+def is_fresh(sources=INFO_FILES, path=KNOWLEDGE_PATH):
+    if not os.path.exists(path):
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            meta = dict(conn.execute("SELECT name, value FROM meta"))
+        finally:
+            conn.close()
+    except sqlite3.Error:
+        return False
+    if meta.get("version") != str(STORE_VERSION):
+        return False
+    recorded = json.loads(meta.get("sources", "{}"))
+    present = {section for section, src in sources.items() if os.path.exists(src)}
+    if set(recorded) != present:
+        return False
+    return all(fingerprint_matches(recorded[section], sources[section]) for section in present)
+
+
+def store_fingerprint(path=KNOWLEDGE_PATH):
+    """Short digest of the source checksums recorded in the store; changes whenever an info CSV does."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        row = conn.execute("SELECT value FROM meta WHERE name='sources'").fetchone()
+    finally:
+        conn.close()
+    sources = json.loads(row[0]) if row else {}
+    checksums = {section: meta["sha256"] for section, meta in sources.items()}
+    return hashlib.sha256(json.dumps(checksums, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+class KnowledgeStore:
+    """Read access to the compiled store, either per disease or all at once."""
+
+    def __init__(self, path=KNOWLEDGE_PATH, sources=INFO_FILES):
+        if not is_fresh(sources, path):
+            build_store(sources, path)
+        self.sections = list(sources)
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+
+    def get(self, disease):
+        """``{section: raw value}`` for one disease name."""
+        rows = self._conn.execute("SELECT section, value FROM knowledge WHERE disease=?", (normalize_key(disease),))
+        return dict(rows)
+
+    def load_all(self):
+        """``{section: {normalized disease: raw value}}`` for every section."""
+        info = {section: {} for section in self.sections}
+        for disease, section, value in self._conn.execute("SELECT disease, section, value FROM knowledge"):
+            info.setdefault(section, {})[disease] = value
+        return info
+
+    def close(self):
+        self._conn.close()
+
+
+def load_knowledge(path=KNOWLEDGE_PATH, sources=INFO_FILES):
+    store = KnowledgeStore(path, sources)
+    try:
+        return store.load_all()
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    build_store()
+    print(f"Wrote {KNOWLEDGE_PATH}")
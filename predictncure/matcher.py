@@ -0,0 +1,78 @@
+"""Indexed fuzzy symptom matcher.
+
+Drop-in replacement for calling ``process.extractOne(tag, symptom_cols)`` per
+tag. Exact and normalized-key hits are answered from dicts; everything else is
+scored with the same ``fuzz.WRatio`` scorer, but only against the symptoms
+that share the most character trigrams with the tag. When the pruned search
+does not reach the threshold the full scan is run, so a tag is never rejected
+that the plain scan would have accepted.
+
+Optional ``synonyms`` (lay term -> symptom name, see
+``predictncure.autocomplete.load_synonyms``) are only used for exact and
+normalized-key hits. They are kept out of fuzzy scoring because WRatio's
+partial matching against short lay terms accepts unrelated tags (e.g.
+"gastritis" scoring 90 against "gas").
+"""
+from collections import Counter, defaultdict
+
+from fuzzywuzzy import fuzz, process, utils
+
+from predictncure.helpers import normalize_key
+
+MATCH_THRESHOLD = 70
+
+
+def _trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymptomMatcher:
+    def __init__(self, symptoms, threshold=MATCH_THRESHOLD, max_candidates=40, synonyms=None):
+        self.symptoms = list(symptoms)
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self._exact = set(self.symptoms)
+        self._by_key = {}
+        for sym in self.symptoms:
+            self._by_key.setdefault(normalize_key(sym), sym)
+        for term, sym in (synonyms or {}).items():
+            self._by_key.setdefault(normalize_key(term), sym)
+        self._processed = [utils.full_process(sym) for sym in self.symptoms]
+        self._index = defaultdict(list)
+        for i, text in enumerate(self._processed):
+            for gram in _trigrams(text):
+                self._index[gram].append(i)
+
+    def _candidates(self, processed):
+        counts = Counter()
+        for gram in _trigrams(processed):
+            counts.update(self._index.get(gram, ()))
+        return sorted(i for i, _ in counts.most_common(self.max_candidates))
+
+    def match(self, tag):
+        """Return ``(symptom, score)`` with the same meaning as ``process.extractOne``."""
+        if tag in self._exact:
+            return tag, 100
+        hit = self._by_key.get(normalize_key(tag))
+        if hit is not None:
+            return hit, 100
+        processed = utils.full_process(tag)
+        best, best_score = None, -1
+        if processed:
+            # Candidates are visited in column order so ties resolve like the full scan.
+            for i in self._candidates(processed):
+                score = fuzz.WRatio(processed, self._processed[i])
+                if score > best_score:
+                    best, best_score = self.symptoms[i], score
+        if best_score >= self.threshold:
+            return best, best_score
+        return process.extractOne(tag, self.symptoms) or (None, 0)
+
+    def match_many(self, tags):
+        """Match every tag in one call; repeated tags are only scored once."""
+        seen = {}
+        for tag in tags:
+            if tag not in seen:
+                seen[tag] = self.match(tag)
+        return [seen[tag] for tag in tags]
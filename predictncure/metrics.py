@@ -0,0 +1,152 @@
+"""In-process timing spans aggregated into fixed-bucket latency histograms.
+
+Hot paths wrap their stages in ``span("match")`` or decorate functions with
+``@timed("db.find_user")``. Each observation is one ``perf_counter`` pair, a
+bisect into log-spaced buckets and a short locked update, so the overhead is
+a few microseconds per span. Percentiles are interpolated geometrically within
+the buckets.
+
+``registry.prometheus()`` renders the Prometheus text exposition format and
+``registry.snapshot()`` a JSON-ready dict. Set ``PREDICTNCURE_METRICS=0`` to
+turn spans into no-ops.
+"""
+import functools
+import heapq
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+# 50 µs .. ~100 s, four buckets per factor of ten.
+BUCKETS = tuple(5e-5 * 10 ** (i / 4) for i in range(26))
+PERCENTILES = (50, 95, 99)
+SLOW_REQUESTS = 20
+RECENT_REQUESTS = 500
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q):
+        """Estimate the ``q``-th percentile by log-linear interpolation within its bucket."""
+        if not self.count:
+            return None
+        rank = self.count * q / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                frac = (rank - seen) / n
+                if i == 0:
+                    return min(BUCKETS[0] * frac, self.max)
+                lo, hi = BUCKETS[i - 1], BUCKETS[i] if i < len(BUCKETS) else max(self.max, BUCKETS[-1])
+                return min(lo * (hi / lo) ** frac, self.max)
+            seen += n
+        return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "max": self.max,
+            **{f"p{q}": self.percentile(q) for q in PERCENTILES},
+        }
+
+
+class Registry:
+    def __init__(self, enabled=None):
+        if enabled is None:
+            enabled = os.environ.get("PREDICTNCURE_METRICS", "1") != "0"
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._recent = deque(maxlen=RECENT_REQUESTS)
+
+    def observe(self, name, seconds):
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(seconds)
+
+    @contextmanager
+    def span(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name):
+        """Decorator recording each call of the wrapped function as span ``name``."""
+        def decorate(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def record_request(self, seconds, **detail):
+        """Remember a finished request so the slowest recent ones can be listed."""
+        if self.enabled:
+            with self._lock:
+                self._recent.append({"time": time.time(), "seconds": seconds, **detail})
+
+    def slowest(self, n=SLOW_REQUESTS):
+        with self._lock:
+            recent = list(self._recent)
+        return heapq.nlargest(n, recent, key=lambda r: r["seconds"])
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._recent.clear()
+
+    def snapshot(self):
+        with self._lock:
+            spans = {name: hist.summary() for name, hist in sorted(self._histograms.items())}
+        return {"spans": spans, "slowest": self.slowest()}
+
+    def prometheus(self, prefix="predictncure"):
+        metric = f"{prefix}_span_seconds"
+        lines = [f"# HELP {metric} Duration of instrumented spans.", f"# TYPE {metric} histogram"]
+        with self._lock:
+            items = [(name, list(h.counts), h.count, h.total) for name, h in sorted(self._histograms.items())]
+        for name, counts, count, total in items:
+            label = name.replace("\\", "\\\\").replace('"', '\\"')
+            cumulative = 0
+            for bound, n in zip(BUCKETS, counts):
+                cumulative += n
+                lines.append(f'{metric}_bucket{{span="{label}",le="{bound:.6g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{span="{label}",le="+Inf"}} {count}')
+            lines.append(f'{metric}_sum{{span="{label}"}} {total:.9g}')
+            lines.append(f'{metric}_count{{span="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+span = registry.span
+timed = registry.timed
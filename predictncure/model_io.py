@@ -0,0 +1,89 @@
+"""Native-format model export.
+
+``export_native`` writes the booster of a fitted sklearn wrapper in the
+library's own format (LightGBM model text, XGBoost UBJSON) with a small JSON
+sidecar recording the library, feature names, class count and the pickle it
+came from, for use outside Python or with a different library version:
+
+    python -m predictncure.model_io lgb_fast.pkl
+
+The app itself always unpickles. Loading the native file was measured as no
+faster than unpickling once sklearn is imported anyway (LightGBM 61.6 ms vs
+51.4 ms, XGBoost 43.8 ms vs 45.8 ms) and saved no memory, so there is no
+native load path.
+"""
+import argparse
+import json
+import os
+
+from predictncure.schema import file_sha256, fingerprint
+
+NATIVE_SUFFIXES = {"lightgbm": ".txt", "xgboost": ".ubj"}
+
+
+def model_library(model):
+    """``"lightgbm"``, ``"xgboost"`` or None for a wrapper, booster or FastModel."""
+    library = getattr(model, "library", None)
+    if library is not None:
+        return library
+    module = type(model).__module__
+    for name in NATIVE_SUFFIXES:
+        if module.startswith(name):
+            return name
+    return None
+
+
+def native_path_for(model_path, library):
+    return os.path.splitext(model_path)[0] + NATIVE_SUFFIXES[library]
+
+
+def export_native(model, model_path, out_path=None):
+    """Write the booster of a fitted sklearn wrapper in native format; returns the path or None.
+
+    ``out_path`` defaults to ``model_path`` with the library's extension; the
+    sidecar is written next to it as ``<out_path>.json``.
+    """
+    library = model_library(model)
+    if library is None:
+        return None
+    path = out_path or native_path_for(model_path, library)
+    # XGBoost picks the output format from the extension, so keep it on the temp name.
+    tmp_path = f"{path}.tmp.{os.getpid()}{NATIVE_SUFFIXES[library]}"
+    if library == "lightgbm":
+        booster = model.booster_
+        booster.save_model(tmp_path)
+        feature_names = booster.feature_name()
+    else:
+        booster = model.get_booster()
+        best = getattr(booster, "best_iteration", None)
+        if best is not None and best + 1 < booster.num_boosted_rounds():
+            booster = booster[: best + 1]
+        booster.save_model(tmp_path)
+        feature_names = booster.feature_names
+    meta = {
+        "library": library,
+        "source": {"sha256": file_sha256(model_path), **fingerprint(model_path)},
+        "feature_names": list(feature_names) if feature_names else None,
+        "n_classes": int(len(model.classes_)),
+    }
+    with open(f"{path}.json", "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export a pickled model's booster in its library's native format.")
+    parser.add_argument("model", help="pickled LightGBM or XGBoost sklearn model")
+    parser.add_argument("--out", help="output path (default: next to the pickle)")
+    args = parser.parse_args(argv)
+
+    import joblib
+    path = export_native(joblib.load(args.model), args.model, args.out)
+    if path is None:
+        parser.error(f"{args.model} is not a LightGBM or XGBoost model.")
+    print(path)
+
+
+if __name__ == "__main__":
+    main()
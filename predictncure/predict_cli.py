@@ -0,0 +1,108 @@
+"""Score symptom sets from a CSV or JSONL file.
+
+JSONL input lines look like ``{"id": "42", "symptoms": ["fever", "cough", "headache"]}``.
+CSV input needs a ``symptoms`` column with ``;``-separated tags and may have an
+``id`` column. Rows are read, scored and written one chunk at a time.
+
+    python -m predictncure.predict_cli intake.jsonl -o predictions.jsonl
+"""
+import argparse
+import csv
+import json
+import sys
+from collections import deque
+
+from predictncure.predictor import iter_predictions
+from predictncure.ranking import ALLOWED_GAP, MIN_CONFIDENCE, TOP_K, Ranker
+from predictncure.resources import load_artifacts
+
+CSV_FIELDS = ["id", "status", "primary", "confidence", "others", "unmatched"]
+
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def read_records(f, fmt, sep=";"):
+    """Yield ``(id, tags)`` pairs without loading the whole file."""
+    if fmt == "csv":
+        for n, row in enumerate(csv.DictReader(f)):
+            tags = [t.strip() for t in (row.get("symptoms") or "").split(sep) if t.strip()]
+            yield row.get("id", str(n)), tags
+    else:
+        for n, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, list):
+                yield str(n), record
+            else:
+                yield record.get("id", str(n)), record.get("symptoms", [])
+
+
+class _Writer:
+    def __init__(self, f, fmt):
+        self.f = f
+        self.csv = csv.DictWriter(f, fieldnames=CSV_FIELDS) if fmt == "csv" else None
+        if self.csv:
+            self.csv.writeheader()
+
+    def write(self, record_id, result):
+        if self.csv:
+            self.csv.writerow({
+                "id": record_id,
+                "status": result["status"],
+                "primary": result["primary"] or "",
+                "confidence": "" if result["confidence"] is None else f"{result['confidence']:.2f}",
+                "others": ";".join(f"{name}:{conf:.2f}" for name, conf in result["others"]),
+                "unmatched": ";".join(result["unmatched"]),
+            })
+        else:
+            self.f.write(json.dumps({"id": record_id, **result}) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch disease prediction from symptom lists.")
+    parser.add_argument("input", help="CSV or JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file, or - for stdout")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"])
+    parser.add_argument("--output-format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    parser.add_argument("--min-confidence", type=float, default=MIN_CONFIDENCE)
+    parser.add_argument("--allowed-gap", type=float, default=ALLOWED_GAP)
+    parser.add_argument("--bundle", help="model bundle directory from predictncure.train")
+    args = parser.parse_args(argv)
+
+    in_fmt = _detect_format(args.input, args.input_format)
+    out_fmt = _detect_format(args.output, args.output_format)
+    res = load_artifacts(bundle=args.bundle)
+
+    fin = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    fout = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = _Writer(fout, out_fmt)
+        ids = deque()
+
+        def symptom_lists():
+            for record_id, tags in read_records(fin, in_fmt):
+                ids.append(record_id)
+                yield tags
+
+        results = iter_predictions(res.model, res.le, res.matcher, symptom_lists(),
+                                   chunk_size=args.chunk_size, encoder=res.encoder, cache=res.cache,
+                                   ranker=Ranker(res.le.classes_, top_k=args.top_k, min_conf=args.min_confidence,
+                                                 allowed_gap=args.allowed_gap))
+        for result in results:
+            writer.write(ids.popleft(), result)
+    finally:
+        if fin is not sys.stdin:
+            fin.close()
+        if fout is not sys.stdout:
+            fout.close()
+
+
+if __name__ == "__main__":
+    main()
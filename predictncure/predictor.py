@@ -0,0 +1,105 @@
+"""Prediction pipeline: symptom matching, feature encoding, scoring and ranking.
+
+``predict_batch`` scores many symptom lists with one ``predict_proba`` call per
+chunk; the Streamlit Predict button goes through the same code with a batch of
+one.
+"""
+import time
+from itertools import islice
+
+from predictncure.encoding import FeatureEncoder
+from predictncure.metrics import registry, span, timed
+from predictncure.ranking import Ranker
+
+MIN_SYMPTOMS = 3
+
+
+@timed("match")
+def match_symptoms(matcher, tags):
+    """Split tags into matched symptom names and tags below the match threshold."""
+    matched, unmatched = [], []
+    for tag, (match, score) in zip(tags, matcher.match_many(tags)):
+        if score >= matcher.threshold:
+            matched.append(match)
+        else:
+            unmatched.append(tag)
+    return matched, unmatched
+
+
+def predict_batch(model, le, matcher, symptom_lists, encoder=None, cache=None, recommendations=None, ranker=None,
+                  **rank_kwargs):
+    """Predict for every symptom list with a single ``predict_proba`` call.
+
+    Each result has a ``status`` of ``"ok"``, ``"low_confidence"``,
+    ``"too_few"`` (fewer than MIN_SYMPTOMS tags) or ``"unmatched"`` (some tag
+    fell below the match threshold, listed in ``unmatched``). Pass the
+    ``FeatureEncoder`` built at load time to avoid rebuilding its index, and
+    a ``Ranker`` (or its ``top_k``/``min_conf``/``allowed_gap`` as keyword
+    arguments) to change the ranking rules.
+
+    With ``recommendations`` each ranked result also carries the rendered
+    ``recommendations`` markdown of its primary disease. With a
+    ``ResultCache``, symptom sets seen before skip encoding, scoring and
+    ranking.
+
+    Stage timings go to ``predictncure.metrics``; each call is recorded as one
+    request.
+    """
+    start = time.perf_counter()
+    encoder = encoder if encoder is not None else FeatureEncoder.for_model(model, matcher.symptoms)
+    ranker = ranker if ranker is not None else Ranker(le.classes_, **rank_kwargs)
+    results, pending = [], []
+    for tags in symptom_lists:
+        tags = list(tags)
+        result = {"input": tags, "matched": [], "unmatched": [], "status": None,
+                  "primary": None, "confidence": None, "others": [], "top": []}
+        results.append(result)
+        if len(tags) < MIN_SYMPTOMS:
+            result["status"] = "too_few"
+            continue
+        result["matched"], result["unmatched"] = match_symptoms(matcher, tags)
+        if result["unmatched"]:
+            result["status"] = "unmatched"
+            continue
+        if cache is not None:
+            # Results with and without rendered recommendations are cached separately.
+            result["cache_key"] = cache.key(result["matched"], {**ranker.params(),
+                                                                "recommendations": recommendations is not None})
+            hit = cache.get(result["cache_key"])
+            if hit is not None:
+                result.update(hit)
+                continue
+        pending.append(result)
+
+    if pending:
+        with span("encode"):
+            X = encoder.encode([r["matched"] for r in pending])
+        with span("inference"):
+            probs = model.predict_proba(X)
+        with span("rank"):
+            ranked_rows = ranker.rank_matrix(probs)
+        for result, ranked in zip(pending, ranked_rows):
+            if recommendations is not None and ranked["status"] == "ok":
+                with span("recommendations"):
+                    ranked["recommendations"] = recommendations.get(ranked["primary"])["markdown"]
+            result.update(ranked)
+            if cache is not None:
+                cache.put(result.pop("cache_key"), ranked)
+    for result in results:
+        result.pop("cache_key", None)
+    if registry.enabled:
+        # Counts and latency only: symptom input is health data and stays out of the metrics log.
+        elapsed = time.perf_counter() - start
+        registry.observe("predict", elapsed)
+        registry.record_request(elapsed, size=len(results), scored=len(pending))
+    return results
+
+
+def iter_predictions(model, le, matcher, symptom_lists, chunk_size=1000, **kwargs):
+    """Stream results for an iterable of symptom lists, holding one chunk in memory."""
+    it = iter(symptom_lists)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield from predict_batch(model, le, matcher, chunk, **kwargs)
@@ -0,0 +1,53 @@
+"""Ranking of predicted probabilities into a primary disease and close alternatives.
+
+Top-k uses ``argpartition`` instead of a full sort over every class, and
+labels are decoded through the encoder's plain ``classes_`` array instead of
+one ``inverse_transform`` call per candidate. ``rank_matrix`` does both for a
+whole probability matrix at once.
+"""
+import numpy as np
+
+MIN_CONFIDENCE = 75.0
+ALLOWED_GAP = 80
+TOP_K = 5
+
+
+class Ranker:
+    def __init__(self, classes, top_k=TOP_K, min_conf=MIN_CONFIDENCE, allowed_gap=ALLOWED_GAP):
+        self.classes = np.asarray([str(c) for c in classes], dtype=object)
+        self.top_k = top_k
+        self.min_conf = min_conf
+        self.allowed_gap = allowed_gap
+
+    def params(self):
+        return {"top_k": self.top_k, "min_conf": self.min_conf, "allowed_gap": self.allowed_gap}
+
+    def top_indices(self, probs):
+        """Indices of the ``top_k`` largest probabilities per row, best first."""
+        probs = np.atleast_2d(probs)
+        k = min(self.top_k, probs.shape[1])
+        if k < probs.shape[1]:
+            part = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+        else:
+            part = np.broadcast_to(np.arange(k), (probs.shape[0], k))
+        order = np.argsort(-np.take_along_axis(probs, part, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(part, order, axis=1)
+
+    def rank_matrix(self, probs):
+        """One result dict per probability row."""
+        probs = np.atleast_2d(probs)
+        idx = self.top_indices(probs)
+        names = self.classes[idx]
+        confs = np.take_along_axis(probs, idx, axis=1) * 100
+        return [self._result(list(n), c.tolist()) for n, c in zip(names, confs)]
+
+    def rank(self, probs):
+        return self.rank_matrix(probs)[0]
+
+    def _result(self, names, confs):
+        top = list(zip(names, confs))
+        primary, conf = top[0]
+        if conf < self.min_conf:
+            return {"status": "low_confidence", "primary": primary, "confidence": conf, "others": [], "top": top}
+        others = [(name, c) for name, c in top[1:] if (conf - c) <= self.allowed_gap]
+        return {"status": "ok", "primary": primary, "confidence": conf, "others": others, "top": top}
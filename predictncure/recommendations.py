@@ -0,0 +1,62 @@
+"""Per-disease recommendation records, parsed and rendered once at load time."""
+import logging
+
+from predictncure.helpers import clean_and_bullet, clean_description_paragraph, normalize_key, parse_items
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ["description", "medications", "diets", "precautions", "workout"]
+MISSING = "No data"
+
+
+def build_record(info, key):
+    """Record for one normalized disease key; absent cells render like the old "No data" path."""
+    items, markdown = {}, {}
+    for section in SECTIONS:
+        raw = info.get(section, {}).get(key, MISSING)
+        if section == "description":
+            items[section] = clean_description_paragraph(raw)
+            markdown[section] = items[section]
+        else:
+            items[section] = parse_items(raw)
+            markdown[section] = clean_and_bullet(raw)
+    return {"items": items, "markdown": markdown}
+
+
+class Recommendations:
+    """Direct lookup of recommendation records by encoder class label."""
+
+    def __init__(self, classes, info):
+        self.info = info
+        self.records = {}
+        self.missing = {}
+        for label in classes:
+            label = str(label)
+            key = normalize_key(label)
+            self.records[label] = build_record(info, key)
+            absent = [section for section in SECTIONS if key not in info.get(section, {})]
+            if absent:
+                self.missing[label] = absent
+        self._by_key = {normalize_key(label): rec for label, rec in self.records.items()}
+
+    def __contains__(self, disease):
+        """True for predictable diseases and for any disease with info rows."""
+        if disease in self.records:
+            return True
+        key = normalize_key(disease)
+        return key in self._by_key or any(key in table for table in self.info.values())
+
+    def get(self, disease):
+        rec = self.records.get(disease)
+        if rec is None:
+            key = normalize_key(disease)
+            rec = self._by_key.get(key)
+            if rec is None:
+                rec = build_record(self.info, key)
+        return rec
+
+    def report_missing(self):
+        """Log predictable diseases that have no rows in some info tables."""
+        for label, sections in sorted(self.missing.items()):
+            logger.warning("No %s recommendations for predictable disease '%s'", ", ".join(sections), label)
+        return self.missing
@@ -0,0 +1,106 @@
+"""Loading of the model, encoder, symptom schema and info tables.
+
+Kept free of Streamlit so the app, the batch CLI and other tools share one
+loader. Missing files raise FileNotFoundError and a model that does not fit
+the schema raises ValueError; callers decide how to report them.
+"""
+import os
+from typing import NamedTuple
+
+import joblib
+
+from predictncure.autocomplete import SymptomIndex, load_synonyms
+from predictncure.bundle import load_bundle
+from predictncure.encoding import FeatureEncoder
+from predictncure.fast_inference import FastModel
+from predictncure.knowledge import load_knowledge, store_fingerprint
+from predictncure.matcher import SymptomMatcher
+from predictncure.metrics import span, timed
+from predictncure.ranking import Ranker
+from predictncure.recommendations import Recommendations
+from predictncure.result_cache import ResultCache
+from predictncure.schema import SCHEMA_PATH, build_schema, check_feature_order, load_schema
+
+MODEL_FILES = ["lgb_fast.pkl", "xgb_fast.pkl"]
+ENCODER_FILES = ["disease_encoder.pkl"]
+DATASET_PATH = "Diseases_and_Symptoms_dataset.csv"
+
+
+class Resources(NamedTuple):
+    model: object
+    le: object
+    symptom_cols: list
+    info: dict
+    matcher: SymptomMatcher
+    encoder: FeatureEncoder
+    recommendations: Recommendations
+    ranker: Ranker
+    cache: ResultCache
+    autocomplete: SymptomIndex
+    schema: dict
+
+
+@timed("load.total")
+def load_artifacts(model_files=MODEL_FILES, enc_files=ENCODER_FILES, dataset_path=DATASET_PATH, fetch_dataset=None,
+                   fast_inference=None, bundle=None):
+    """Load everything needed for prediction.
+
+    ``fetch_dataset`` is called with the dataset path when the symptom schema
+    has to be rebuilt, so callers can download the CSV only when it is needed.
+    ``fast_inference`` wraps the model in FastModel; it defaults to on unless
+    ``PREDICTNCURE_FAST_INFERENCE=0``. ``PREDICTNCURE_RESULT_CACHE`` names a
+    SQLite file through which workers share cached prediction results.
+
+    ``bundle`` (default ``PREDICTNCURE_BUNDLE``) is a directory written by
+    ``predictncure.train``; its checksummed model, encoder and schema are used
+    instead of the files in the working directory.
+    """
+    bundle = bundle or os.environ.get("PREDICTNCURE_BUNDLE")
+    schema_path = SCHEMA_PATH
+    if bundle:
+        manifest = load_bundle(bundle)
+        model_files, enc_files, schema_path = [manifest["model"]], [manifest["encoder"]], manifest["schema"]
+    model_path = next((x for x in model_files if os.path.exists(x)), None)
+    enc_path = next((x for x in enc_files if os.path.exists(x)), None)
+    if not model_path or not enc_path:
+        raise FileNotFoundError("Model or encoder missing in root folder.")
+
+    # The symptom schema is rebuilt from the dataset header only when missing or stale.
+    artifacts = {"model": model_path, "encoder": enc_path}
+    with span("load.schema"):
+        schema = load_schema(artifacts, schema_path)
+        if schema is None and bundle:
+            raise ValueError(f"Symptom schema in bundle {bundle} does not match its model and encoder.")
+        if schema is None:
+            if fetch_dataset is not None:
+                fetch_dataset(dataset_path)
+            if not os.path.exists(dataset_path):
+                raise FileNotFoundError(f"Dataset missing: {dataset_path} not found.")
+            schema = build_schema(dataset_path, artifacts)
+    symptom_cols = schema["symptoms"]
+
+    with span("load.model"):
+        model = joblib.load(model_path)
+        le = joblib.load(enc_path)
+    try:
+        check_feature_order(model, symptom_cols)
+    except ValueError as e:
+        raise ValueError(f"Symptom schema does not match the model: {e}") from e
+
+    if fast_inference is None:
+        fast_inference = os.environ.get("PREDICTNCURE_FAST_INFERENCE", "1") != "0"
+    if fast_inference:
+        with span("load.fast_inference"):
+            model = FastModel(model, n_features=len(symptom_cols))
+
+    with span("load.knowledge"):
+        info = load_knowledge()
+        recommendations = Recommendations(le.classes_, info)
+    recommendations.report_missing()
+    synonyms = load_synonyms(symptom_cols)
+    # Cached results carry rendered recommendations, so edited info tables must invalidate them too.
+    cache = ResultCache(version=f"{schema['checksum']}:{store_fingerprint()}",
+                        path=os.environ.get("PREDICTNCURE_RESULT_CACHE"))
+    return Resources(model, le, symptom_cols, info, SymptomMatcher(symptom_cols, synonyms=synonyms),
+                     FeatureEncoder.for_model(model, symptom_cols), recommendations,
+                     Ranker(le.classes_), cache, SymptomIndex(symptom_cols, synonyms), schema)
@@ -0,0 +1,139 @@
+"""Prediction result cache keyed on canonical symptom sets.
+
+Keys are built from the sorted, de-duplicated matched symptoms, the ranking
+parameters (plus whether recommendations were rendered) and a version
+string. ``load_artifacts`` sets the version from the symptom schema checksum,
+which covers the model and encoder, and the knowledge store fingerprint,
+which covers the info CSVs behind the cached recommendation text. A new
+model or an edited info table therefore never serves stale results.
+
+Entries live in an in-process LRU with a TTL and, optionally, in a SQLite
+file that several workers share. The shared table is purged of expired rows
+when opened and every ``PURGE_EVERY`` writes, and trimmed to ``max_rows``
+by dropping the entries closest to expiry.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+PURGE_EVERY = 256
+
+_live = weakref.WeakSet()
+
+
+class ResultCache:
+    def __init__(self, version="", maxsize=4096, ttl=3600, path=None, clock=time.time, max_rows=100000):
+        self.version = version
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.clock = clock
+        self.max_rows = max_rows
+        self.hits = self.misses = self.shared_hits = 0
+        self._writes = 0
+        _live.add(self)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_expires ON results (expires)")
+            self._conn.commit()
+            self.purge_expired()
+
+    def key(self, matched, params=None):
+        canonical = json.dumps([self.version, sorted(set(matched)), params or {}], sort_keys=True)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+    def _remember(self, key, value, expires):
+        self._entries[key] = (value, expires)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def get(self, key):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            if self._conn is not None:
+                row = self._conn.execute("SELECT value, expires FROM results WHERE key=? AND expires > ?",
+                                         (key, now)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self.hits += 1
+                    self.shared_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        expires = self.clock() + self.ttl
+        with self._lock:
+            self._remember(key, value, expires)
+            if self._conn is not None:
+                try:
+                    self._conn.execute("INSERT OR REPLACE INTO results VALUES (?,?,?)",
+                                       (key, json.dumps(value), expires))
+                    self._conn.commit()
+                    self._writes += 1
+                    if self._writes % PURGE_EVERY == 0:
+                        self._purge()
+                except sqlite3.OperationalError:
+                    # A busy shared store only costs a future miss.
+                    pass
+
+    def _purge(self):
+        self._conn.execute("DELETE FROM results WHERE expires <= ?", (self.clock(),))
+        excess = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0] - self.max_rows
+        if excess > 0:
+            self._conn.execute("DELETE FROM results WHERE key IN "
+                               "(SELECT key FROM results ORDER BY expires LIMIT ?)", (excess,))
+        self._conn.commit()
+
+    def purge_expired(self):
+        """Drop expired shared rows and trim the table to ``max_rows``."""
+        if self._conn is not None:
+            with self._lock:
+                try:
+                    self._purge()
+                except sqlite3.OperationalError:
+                    pass
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+def live_stats():
+    """Stats summed over the caches alive in this process, or None if none was created yet.
+
+    Lets a dashboard report cache use without loading the model to reach a cache.
+    """
+    stats = [cache.stats() for cache in list(_live)]
+    if not stats:
+        return None
+    total = {name: sum(s[name] for s in stats) for name in ("hits", "misses", "shared_hits", "size")}
+    lookups = total["hits"] + total["misses"]
+    total["hit_rate"] = total["hits"] / lookups if lookups else 0.0
+    return total
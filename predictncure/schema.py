@@ -0,0 +1,141 @@
+"""Symptom schema artifact.
+
+The model only needs the ordered list of symptom columns from
+Diseases_and_Symptoms_dataset.csv. That list is read once from the CSV header
+and stored in a small JSON file together with checksums of the model and
+encoder it belongs to, so later starts never touch the dataset.
+"""
+import csv
+import hashlib
+import json
+import os
+import re
+
+from predictncure.helpers import normalize_key
+
+SCHEMA_VERSION = 1
+SCHEMA_PATH = "symptom_schema.json"
+LABEL_COLUMNS = ("diseases", "disease")
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_symptom_header(dataset_path):
+    """Return the symptom columns of the dataset without reading any rows."""
+    with open(dataset_path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f))
+    return [c for c in header if c.lower() not in LABEL_COLUMNS]
+
+
+def schema_checksum(symptoms, artifact_entries):
+    digest = hashlib.sha256()
+    digest.update(json.dumps(symptoms).encode("utf-8"))
+    for name in sorted(artifact_entries):
+        digest.update(f"{name}:{artifact_entries[name]['sha256']}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_schema(dataset_path, artifacts, schema_path=SCHEMA_PATH):
+    """Build the schema from the dataset header and write it atomically.
+
+    ``artifacts`` maps a role (``"model"``, ``"encoder"``) to a file path.
+    """
+    symptoms = read_symptom_header(dataset_path)
+    entries = {}
+    for name, path in artifacts.items():
+        entries[name] = {"path": os.path.basename(path), "sha256": file_sha256(path), **fingerprint(path)}
+    schema = {
+        "version": SCHEMA_VERSION,
+        "symptoms": symptoms,
+        "artifacts": entries,
+        "checksum": schema_checksum(symptoms, entries),
+    }
+    tmp_path = f"{schema_path}.tmp.{os.getpid()}"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(schema, f, indent=1)
+    os.replace(tmp_path, schema_path)
+    return schema
+
+
+def fingerprint_matches(entry, path):
+    """True if ``path`` still has the content recorded in ``entry``."""
+    if not os.path.exists(path):
+        return False
+    fp = fingerprint(path)
+    if fp["size"] != entry.get("size"):
+        return False
+    if fp["mtime_ns"] == entry.get("mtime_ns"):
+        return True
+    # Same size but touched (e.g. re-downloaded): fall back to the content hash.
+    return file_sha256(path) == entry.get("sha256")
+
+
+def load_schema(artifacts, schema_path=SCHEMA_PATH):
+    """Return the stored schema, or None when it is missing or stale."""
+    if not os.path.exists(schema_path):
+        return None
+    try:
+        with open(schema_path, encoding="utf-8") as f:
+            schema = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if schema.get("version") != SCHEMA_VERSION or not schema.get("symptoms"):
+        return None
+    entries = schema.get("artifacts", {})
+    if set(entries) != set(artifacts):
+        return None
+    for name, path in artifacts.items():
+        if not fingerprint_matches(entries[name], path):
+            return None
+    return schema
+
+
+def ensure_schema(dataset_path, artifacts, schema_path=SCHEMA_PATH):
+    """Load the schema, rebuilding it from the dataset header when missing or stale."""
+    schema = load_schema(artifacts, schema_path)
+    if schema is None:
+        if not os.path.exists(dataset_path):
+            raise FileNotFoundError(f"Dataset missing: {dataset_path} not found.")
+        schema = build_schema(dataset_path, artifacts, schema_path)
+    return schema
+
+
+def model_feature_names(model):
+    """Feature names recorded by a LightGBM/XGBoost model, or None if unnamed."""
+    names = getattr(model, "feature_names_in_", None)
+    if names is None:
+        names = getattr(model, "feature_name_", None)
+    if names is None and hasattr(model, "get_booster"):
+        names = model.get_booster().feature_names
+    if names is None:
+        return None
+    names = list(names)
+    # Models fitted on bare arrays get placeholder names that carry no order information.
+    if all(re.fullmatch(r"(Column_|f)\d+", str(n)) for n in names):
+        return None
+    return names
+
+
+def check_feature_order(model, symptoms):
+    """Raise ValueError if the model expects different features than the schema."""
+    n_features = getattr(model, "n_features_in_", None)
+    if n_features is not None and n_features != len(symptoms):
+        raise ValueError(f"Model expects {n_features} features but the schema has {len(symptoms)}.")
+    names = model_feature_names(model)
+    if names is None:
+        return
+    # LightGBM replaces whitespace in feature names, so compare normalized keys.
+    for i, (expected, actual) in enumerate(zip(names, symptoms)):
+        if normalize_key(str(expected)) != normalize_key(actual):
+            raise ValueError(f"Feature order mismatch at column {i}: model has '{expected}', schema has '{actual}'.")
@@ -0,0 +1,214 @@
+"""Headless HTTP prediction service.
+
+A dependency-free ASGI application over the same artifacts as the Streamlit
+app. Run it with any ASGI server, e.g.::
+
+    uvicorn predictncure.service:app --port 8000
+
+Endpoints:
+
+* ``POST /predict`` with ``{"symptoms": [...]}`` returns one result;
+  ``{"batch": [[...], ...]}`` returns ``{"results": [...]}``.
+* ``GET /symptoms?prefix=...&limit=...`` lists symptom names for autocomplete.
+* ``GET /recommendations/{disease}`` returns the parsed recommendation record.
+* ``GET /health``.
+* ``GET /metrics`` exposes span latency histograms in Prometheus text format.
+
+Inference runs on a thread pool so the event loop stays responsive. Single
+``/predict`` requests arriving within a few milliseconds of each other are
+micro-batched into one ``predict_batch`` call (one ``predict_proba``).
+"""
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote
+
+from predictncure.metrics import registry
+from predictncure.predictor import predict_batch
+from predictncure.resources import load_artifacts
+
+MAX_BODY = 1 << 20
+MAX_BATCH = 1000
+
+
+class MicroBatcher:
+    """Collects single items for up to ``max_wait`` seconds and runs them as one batch."""
+
+    def __init__(self, fn, executor, max_batch=64, max_wait=0.005):
+        self.fn = fn
+        self.executor = executor
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = None
+        self._task = None
+
+    async def submit(self, item):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._collect())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            loop.create_task(self._dispatch(batch))
+
+    async def _dispatch(self, batch):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.fn, [item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PredictionService:
+    def __init__(self, resources=None, workers=None, max_batch=64, max_wait=0.005):
+        self.res = resources
+        self.executor = ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 4,
+                                           thread_name_prefix="predict")
+        self.batcher = MicroBatcher(self.predict_many, self.executor, max_batch, max_wait)
+
+    def predict_many(self, symptom_lists):
+        res = self.res
+        return predict_batch(res.model, res.le, res.matcher, symptom_lists, res.encoder, cache=res.cache,
+                             recommendations=res.recommendations, ranker=res.ranker)
+
+    async def startup(self):
+        if self.res is None:
+            self.res = await asyncio.get_running_loop().run_in_executor(self.executor, load_artifacts)
+
+    async def shutdown(self):
+        await self.batcher.close()
+        self.executor.shutdown(wait=False)
+
+    # ---------------- HANDLERS ----------------
+    async def handle_predict(self, body):
+        if isinstance(body.get("symptoms"), list):
+            return await self.batcher.submit([str(s) for s in body["symptoms"]])
+        batch = body.get("batch")
+        if isinstance(batch, list) and all(isinstance(tags, list) for tags in batch):
+            if len(batch) > MAX_BATCH:
+                raise HTTPError(413, f"At most {MAX_BATCH} symptom lists per request.")
+            lists = [[str(s) for s in tags] for tags in batch]
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.predict_many, lists)
+            return {"results": results}
+        raise HTTPError(400, 'Expected {"symptoms": [...]} or {"batch": [[...], ...]}.')
+
+    def handle_symptoms(self, query):
+        prefix = query.get("prefix", [""])[0]
+        limit = max(1, min(int(query.get("limit", ["20"])[0]), 100))
+        return {"symptoms": self.res.autocomplete(prefix, limit)}
+
+    def handle_recommendations(self, disease):
+        if disease not in self.res.recommendations:
+            raise HTTPError(404, f"No recommendations for '{disease}'.")
+        return {"disease": disease, **self.res.recommendations.get(disease)}
+
+    async def route(self, method, path, query, body):
+        if path == "/health" and method == "GET":
+            return {"status": "ok", "cache": self.res.cache.stats()}
+        if path == "/predict":
+            if method != "POST":
+                raise HTTPError(405, "Use POST.")
+            return await self.handle_predict(body)
+        if path == "/symptoms" and method == "GET":
+            return self.handle_symptoms(query)
+        if path.startswith("/recommendations/") and method == "GET":
+            return self.handle_recommendations(unquote(path[len("/recommendations/"):]))
+        raise HTTPError(404, "Not found.")
+
+    # ---------------- ASGI ----------------
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        if scope["path"] == "/metrics" and scope["method"] == "GET":
+            await self._send(send, 200, registry.prometheus().encode("utf-8"),
+                             b"text/plain; version=0.0.4; charset=utf-8")
+            return
+        try:
+            if self.res is None:
+                await self.startup()
+            body = await self._read_json(receive) if scope["method"] == "POST" else {}
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            status, payload = 200, await self.route(scope["method"], scope["path"], query, body)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        await self._send(send, status, json.dumps(payload).encode("utf-8"))
+
+    async def _send(self, send, status, data, content_type=b"application/json"):
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", content_type), (b"content-length", str(len(data)).encode())]})
+        await send({"type": "http.response.body", "body": data})
+
+    async def _read_json(self, receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_BODY:
+                raise HTTPError(413, "Request body too large.")
+            chunks.append(chunk)
+            if not message.get("more_body"):
+                break
+        try:
+            body = json.loads(b"".join(chunks) or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON.")
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Request body must be a JSON object.")
+        return body
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+app = PredictionService()
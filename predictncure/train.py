@@ -0,0 +1,121 @@
+"""Retrain the LightGBM model and label encoder from the symptom dataset.
+
+The CSV is read in chunks with every symptom column parsed as ``uint8`` and
+each chunk is turned into a sparse CSR block straight away, so peak memory is
+a few chunks plus the (mostly empty) sparse matrix rather than a dense int64
+frame. The model is fitted on all cores and written with its encoder and
+symptom schema as a versioned bundle (see ``predictncure.bundle``):
+
+    python -m predictncure.train --out-dir bundles
+    PREDICTNCURE_BUNDLE=bundles/<version> streamlit run app.py
+
+``--sample 0.05`` trains on a random 5% of rows for a quick local check.
+"""
+import argparse
+import os
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from predictncure.bundle import write_bundle
+from predictncure.resources import DATASET_PATH
+from predictncure.schema import LABEL_COLUMNS, file_sha256, read_symptom_header
+
+
+def label_column(dataset_path):
+    header = pd.read_csv(dataset_path, nrows=0, encoding="utf-8-sig").columns
+    return next(c for c in header if c.lower() in LABEL_COLUMNS)
+
+
+def read_dataset(dataset_path, chunk_size=20000, sample=None, seed=0):
+    """Return ``(X, labels, symptoms)`` with X as a float32 CSR matrix."""
+    symptoms = read_symptom_header(dataset_path)
+    label = label_column(dataset_path)
+    dtypes = {label: str, **{s: np.uint8 for s in symptoms}}
+    rng = np.random.default_rng(seed)
+    blocks, labels = [], []
+    for chunk in pd.read_csv(dataset_path, dtype=dtypes, chunksize=chunk_size, encoding="utf-8-sig"):
+        if sample is not None:
+            chunk = chunk[rng.random(len(chunk)) < sample]
+        blocks.append(sparse.csr_matrix(chunk[symptoms].to_numpy(), dtype=np.float32))
+        labels.append(chunk[label].to_numpy())
+    X = sparse.vstack(blocks, format="csr") if blocks else sparse.csr_matrix((0, len(symptoms)), dtype=np.float32)
+    return X, np.concatenate(labels) if labels else np.array([], dtype=object), symptoms
+
+
+def keep_top_classes(X, labels, n):
+    """Restrict to the ``n`` most frequent diseases."""
+    names, counts = np.unique(labels, return_counts=True)
+    keep = np.isin(labels, names[np.argsort(-counts, kind="stable")[:n]])
+    return X[keep], labels[keep]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def train(X, labels, symptoms, n_estimators=200, num_leaves=31, learning_rate=0.1, seed=0):
+    import lightgbm as lgb
+    from sklearn.preprocessing import LabelEncoder
+
+    le = LabelEncoder().fit(labels)
+    model = lgb.LGBMClassifier(n_estimators=n_estimators, num_leaves=num_leaves, learning_rate=learning_rate,
+                               n_jobs=os.cpu_count(), random_state=seed, verbose=-1)
+    model.fit(X, le.transform(labels), feature_name=[s.replace(" ", "_") for s in symptoms])
+    return model, le
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the disease model and write a versioned bundle.")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--out-dir", default="bundles")
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    parser.add_argument("--sample", type=float, help="fraction of rows to keep, e.g. 0.05")
+    parser.add_argument("--top-classes", type=int, help="keep only the N most frequent diseases")
+    parser.add_argument("--n-estimators", type=int, default=200)
+    parser.add_argument("--num-leaves", type=int, default=31)
+    parser.add_argument("--learning-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.sample is not None and not 0 < args.sample <= 1:
+        parser.error("--sample must be in (0, 1]")
+
+    start = time.perf_counter()
+    X, labels, symptoms = read_dataset(args.dataset, args.chunk_size, args.sample, args.seed)
+    if args.top_classes:
+        X, labels = keep_top_classes(X, labels, args.top_classes)
+    if not len(labels):
+        sys.exit("No rows to train on.")
+    read_seconds = time.perf_counter() - start
+    dense_mb = X.shape[0] * X.shape[1] * 8 / (1 << 20)
+    sparse_mb = (X.data.nbytes + X.indices.nbytes + X.indptr.nbytes) / (1 << 20)
+    print(f"read {X.shape[0]:,} rows x {X.shape[1]} symptoms in {read_seconds:.1f}s "
+          f"({sparse_mb:.1f} MiB sparse vs {dense_mb:.1f} MiB as dense int64)", file=sys.stderr)
+
+    model, le = train(X, labels, symptoms, args.n_estimators, args.num_leaves, args.learning_rate, args.seed)
+    fit_seconds = time.perf_counter() - start - read_seconds
+    print(f"fitted {len(le.classes_)} classes on {os.cpu_count()} cores in {fit_seconds:.1f}s", file=sys.stderr)
+
+    params = {k: getattr(args, k) for k in ("sample", "top_classes", "n_estimators", "num_leaves",
+                                            "learning_rate", "seed")}
+    info = {
+        "dataset": {"path": os.path.basename(args.dataset), "sha256": file_sha256(args.dataset),
+                    "rows": X.shape[0], "classes": len(le.classes_)},
+        "params": params,
+        "stats": {"read_seconds": round(read_seconds, 2), "fit_seconds": round(fit_seconds, 2),
+                  "peak_rss_mb": round(peak_rss_mb(), 1)},
+    }
+    path = write_bundle(args.out_dir, model, le, args.dataset, info)
+    wall = time.perf_counter() - start
+    print(f"wrote {path} in {wall:.1f}s wall, peak RSS {peak_rss_mb():.0f} MiB", file=sys.stderr)
+    print(path)
+
+
+if __name__ == "__main__":
+    main()